@@ -0,0 +1,137 @@
+"""Accuracy and CPU throughput of the embedding backends against the PyTorch baseline.
+
+Embeds the job texts built from "Linkedin Response.txt" (title plus the description the fake job site serves)
+and a set of search queries with every backend. For each backend it reports the cosine between its vectors and
+the torch vectors, how often the relevance decision (query similarity > 0.5) matches the torch decision, the
+largest similarity drift, and texts per second at each intra-op thread count. A backend below --min-cosine or
+--min-agreement makes the run fail.
+
+    python benchmarks/bench_embedding_backends.py [--backends torch,onnx,onnx-int8] [--threads 1,2,4] [--repeat 3] [--json out.json]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+import types
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+sys.path.insert(0, BENCH_DIR)
+
+import numpy as np
+from bs4 import BeautifulSoup
+
+import job_finder
+from fake_job_site import JobBoard
+
+QUERIES = [
+    ("Data Analyst", "SQL, Python, Power BI"),
+    ("Business Intelligence Analyst", "Tableau, SQL, Excel"),
+    ("Data Scientist", "Python, machine learning, statistics"),
+    ("Data Engineer", "Spark, Airflow, SQL"),
+    ("Financial Analyst", "Excel, financial modelling, reporting"),
+    ("Software Engineer", "Java, Spring, microservices"),
+    ("Marketing Analyst", "Google Analytics, SQL, A/B testing"),
+    ("Product Manager", "roadmaps, user research, analytics"),
+]
+
+
+def job_texts():
+    board = JobBoard(glassdoor_jobs=0)
+    return [
+        job_finder.job_text({
+            "job_title": job["job_title"],
+            "description": BeautifulSoup(job["description_html"], "html.parser").get_text(" "),
+        })
+        for job in board.linkedin
+    ]
+
+
+def query_texts():
+    return [job_finder.build_query(types.SimpleNamespace(position=position, skills=skills)) for position, skills in QUERIES]
+
+
+def encode(model, texts):
+    return model.encode(
+        texts, batch_size=job_finder.EMBEDDING_BATCH_SIZE, normalize_embeddings=True, convert_to_numpy=True
+    ).astype(np.float32)
+
+
+def throughput(model, texts, repeat):
+    encode(model, texts[:job_finder.EMBEDDING_BATCH_SIZE])  # warm-up
+    started = time.perf_counter()
+    for _ in range(repeat):
+        encode(model, texts)
+    return repeat * len(texts) / (time.perf_counter() - started)
+
+
+def agreement(baseline, candidate, threshold):
+    """Cosine to the baseline per text, and agreement of the query-similarity threshold decisions."""
+    cosines = np.sum(baseline["jobs"] * candidate["jobs"], axis=1)
+    base_scores = baseline["jobs"] @ baseline["queries"].T
+    scores = candidate["jobs"] @ candidate["queries"].T
+    return {
+        "cosine_mean": float(cosines.mean()),
+        "cosine_min": float(cosines.min()),
+        "decision_agreement": float(np.mean((base_scores > threshold) == (scores > threshold))),
+        "max_score_drift": float(np.abs(base_scores - scores).max()),
+        "baseline_relevant": int(np.count_nonzero(base_scores > threshold)),
+        "pairs": int(base_scores.size),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--backends", default=",".join(job_finder.EMBEDDING_BACKENDS))
+    parser.add_argument("--threads", default="1,2,4", help="comma-separated intra-op thread counts to time")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--threshold", type=float, default=job_finder.RELEVANCE_THRESHOLD)
+    parser.add_argument("--min-cosine", type=float, default=0.99, help="lowest acceptable per-text cosine to torch")
+    parser.add_argument("--min-agreement", type=float, default=0.99, help="lowest acceptable decision agreement")
+    parser.add_argument("--json", help="also write the results to this file")
+    args = parser.parse_args()
+
+    backends = ["torch"] + [name for name in args.backends.split(",") if name and name != "torch"]
+    thread_counts = [int(count) for count in args.threads.split(",")]
+    jobs, queries = job_texts(), query_texts()
+    print(f"{len(jobs)} job texts, {len(queries)} queries, threshold {args.threshold}")
+
+    results = {}
+    vectors = {}
+    for backend in backends:
+        result = results[backend] = {"texts_per_second": {}}
+        for threads in thread_counts:
+            model = job_finder.load_embedding_model(backend, threads, experimental=True)
+            if backend not in vectors:
+                vectors[backend] = {"jobs": encode(model, jobs), "queries": encode(model, queries)}
+            result["texts_per_second"][threads] = throughput(model, jobs, args.repeat)
+        if backend != "torch":
+            result.update(agreement(vectors["torch"], vectors[backend], args.threshold))
+
+    failures = 0
+    print(f"\n{'backend':<10} " + " ".join(f"{f'{threads} thr/s':>10}" for threads in thread_counts)
+          + f" {'speedup':>8} {'cos mean':>9} {'cos min':>8} {'agree':>7} {'drift':>7}")
+    for backend, result in results.items():
+        rates = result["texts_per_second"]
+        speedup = max(rates.values()) / max(results["torch"]["texts_per_second"].values())
+        line = f"{backend:<10} " + " ".join(f"{rates[threads]:>10.1f}" for threads in thread_counts) + f" {speedup:>7.2f}x"
+        if backend != "torch":
+            line += (
+                f" {result['cosine_mean']:>9.4f} {result['cosine_min']:>8.4f} "
+                f"{result['decision_agreement']:>7.2%} {result['max_score_drift']:>7.4f}"
+            )
+            if result["cosine_min"] < args.min_cosine or result["decision_agreement"] < args.min_agreement:
+                failures += 1
+                line += "  BELOW LIMITS"
+        print(line)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"threshold": args.threshold, "backends": results}, f, indent=1)
+    if failures:
+        sys.exit(f"{failures} backend(s) disagree with the torch baseline beyond the limits")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""Micro-benchmark for LinkedIn job detail parsing on synthetic job view pages.
+
+Compares the old path (the whole driver.page_source through html.parser) with the
+fragment path (only the top card and description, parsed with lxml) and checks that
+every variant returns the same job dict.
+
+The pages in benchmarks/fixtures are synthetic, not saved LinkedIn pages: only a top card and
+description in LinkedIn's job view markup. Each --page-kb size pads them with generated CSS and
+script filler up to about that many KB, so the page_source timings show how parsing scales with
+page weight rather than the cost of any real LinkedIn page.
+
+    python benchmarks/bench_linkedin_parse.py [--page-kb 0,100,400] [--repeat 50]
+"""
+import argparse
+import glob
+import hashlib
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import lxml.html
+
+from job_finder import JobSearchCriteria, parse_linkedin_job_html
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+CRITERIA = JobSearchCriteria(
+    position="Data Analyst",
+    experience="2 years",
+    salary="70,000 PKR to 120,000 PKR",
+    jobNature="onsite",
+    location="Pakistan",
+    skills="SQL, Python, Power BI",
+)
+
+
+def pad_page(page, page_kb):
+    """page with generated CSS rules in its head and script lines before </body>, to about page_kb KB."""
+    missing = page_kb * 1024 - len(page.encode("utf-8"))
+    if missing <= 0:
+        return page
+    rules = []
+    lines = []
+    size = 0
+    while size < missing:
+        index = len(lines)
+        rules.append(f".c{index}{{margin:{index % 16}px;padding:{index % 8}px;color:#{index % 4096:03x}}}")
+        lines.append(f'var config_{index} = {{"k{index}": "{hashlib.sha1(str(index).encode()).hexdigest()}", "v": {index}}};')
+        size += len(rules[-1]) + len(lines[-1]) + 1
+    page = page.replace("</head>", f"  <style>{''.join(rules)}</style>\n</head>", 1)
+    return page.replace("</body>", '  <script type="text/javascript">\n' + "\n".join(lines) + "\n  </script>\n</body>", 1)
+
+
+def has_class(class_name):
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {class_name} ')"
+
+
+def extract_fragments(html):
+    """Offline stand-in for LINKEDIN_FRAGMENT_JS: outerHTML of the top card plus the description."""
+    root = lxml.html.fromstring(html)
+    fragments = []
+    titles = root.xpath(f"//h2[{has_class('top-card-layout__title')}]")
+    if titles:
+        top_card = titles[0].xpath(f"ancestor-or-self::*[{has_class('top-card-layout')}][1]")
+        fragments.append(top_card[0] if top_card else titles[0].getparent())
+    descriptions = root.xpath(f"//div[{has_class('description__text')} and {has_class('description__text--rich')}]")
+    fragments.extend(descriptions[:1])
+    return "".join(lxml.html.tostring(fragment, encoding="unicode", with_tail=False) for fragment in fragments)
+
+
+def time_parse(html, parser, repeat):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        job = parse_linkedin_job_html(html, "https://example.invalid/job", CRITERIA, parser=parser)
+    return (time.perf_counter() - started) / repeat, job
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument("--page-kb", default="0,100,400", help="comma-separated padded page sizes (0: unpadded)")
+    arg_parser.add_argument("--repeat", type=int, default=50)
+    args = arg_parser.parse_args()
+
+    paths = sorted(glob.glob(os.path.join(FIXTURES, "linkedin_job_view*.html")))
+    if not paths:
+        sys.exit(f"No fixture pages in {FIXTURES}")
+
+    print(f"{'fixture':<28} {'page KB':>7} {'variant':<28} {'bytes/card':>11} {'ms/card':>9} {'speedup':>8}")
+    failures = 0
+    for path, page_kb in ((path, int(kb)) for path in paths for kb in args.page_kb.split(",")):
+        with open(path, encoding="utf-8") as f:
+            page = pad_page(f.read(), page_kb)
+        fragment = extract_fragments(page)
+        variants = [
+            ("page_source + html.parser", page, "html.parser"),
+            ("page_source + lxml", page, "lxml"),
+            ("fragment + lxml", fragment, "lxml"),
+        ]
+        baseline_seconds = baseline_job = None
+        for name, html, parser in variants:
+            seconds, job = time_parse(html, parser, args.repeat)
+            if baseline_job is None:
+                baseline_seconds, baseline_job = seconds, job
+            elif job != baseline_job:
+                failures += 1
+                print(f"  MISMATCH in {name}: {job!r} != {baseline_job!r}")
+            print(
+                f"{os.path.basename(path):<28} {page_kb:>7} {name:<28} {len(html.encode('utf-8')):>11} "
+                f"{seconds * 1000:>9.3f} {baseline_seconds / seconds:>7.1f}x"
+            )
+    if failures:
+        sys.exit(f"{failures} variant(s) disagreed with the html.parser baseline")
+
+
+if __name__ == "__main__":
+    main()
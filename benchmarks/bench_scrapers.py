@@ -0,0 +1,232 @@
+"""End-to-end offline benchmark: both scrapers, the relevance stage and POST /search_jobs against the fake job site.
+
+Starts benchmarks/fake_job_site.py in-process, points LINKEDIN_BASE_URL and GLASSDOOR_BASE_URL at it, uses a
+fresh cache directory, and reports wall time, WebDriver commands, fake-site requests and throughput per stage.
+Scraped jobs are checked against the served postings, which come from "Linkedin Response.txt"; any missing
+or mismatching job makes the run fail. Every served posting is relevant, so the bench also reports the recall of
+card triage over the served cards, for CARD_TRIAGE and for lexical triage, and the run fails when the configured
+CARD_TRIAGE would skip a served posting. Needs Chrome and the model, like the API itself.
+
+    python benchmarks/bench_scrapers.py [--latency-ms 50] [--linkedin-jobs N] [--glassdoor-jobs 60] [--json out.json]
+
+Scraper settings such as DRIVER_POOL_SIZE, LINKEDIN_DETAIL_MODE or LINKEDIN_SHARDS are read from the
+environment as usual, so the same command compares configurations.
+"""
+import argparse
+import collections
+import contextlib
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from urllib.parse import parse_qs, urlsplit
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+sys.path.insert(0, BENCH_DIR)
+
+from selenium.webdriver.remote.webdriver import WebDriver
+
+from fake_job_site import FakeJobSite, JobBoard, linkedin_job_id
+
+CRITERIA = {
+    "position": "Data Analyst",
+    "experience": "2 years",
+    "salary": "70,000 PKR to 120,000 PKR",
+    "jobNature": "onsite",
+    "location": "Pakistan",
+    "skills": "SQL, Python, Power BI",
+}
+LINKEDIN_FIELDS = ("job_title", "company", "location", "experience", "jobNature", "salary")
+GLASSDOOR_FIELDS = ("job_title", "company", "location", "salary")
+
+
+class StageRecorder:
+    """Wall time, WebDriver commands and fake-site requests per benchmark stage."""
+
+    def __init__(self, site):
+        self.site = site
+        self.stages = []
+        self.commands = collections.Counter()
+        self._lock = threading.Lock()
+
+    def count_command(self, command):
+        with self._lock:
+            self.commands[command] += 1
+
+    @contextlib.contextmanager
+    def stage(self, name):
+        with self._lock:
+            commands_before = collections.Counter(self.commands)
+        requests_before = collections.Counter(self.site.requests)
+        record = {"stage": name, "items": 0}
+        started = time.perf_counter()
+        try:
+            yield record
+        finally:
+            record["seconds"] = time.perf_counter() - started
+            with self._lock:
+                record["commands"] = dict(self.commands - commands_before)
+            record["requests"] = dict(collections.Counter(self.site.requests) - requests_before)
+            self.stages.append(record)
+
+    def report(self):
+        print(f"\n{'stage':<24} {'wall s':>8} {'items':>6} {'items/s':>8} {'wd cmds':>8} {'http reqs':>9}  top commands")
+        for record in self.stages:
+            commands = record["commands"]
+            top = ", ".join(f"{name}={count}" for name, count in collections.Counter(commands).most_common(4))
+            rate = record["items"] / record["seconds"] if record["seconds"] else 0.0
+            print(
+                f"{record['stage']:<24} {record['seconds']:>8.2f} {record['items']:>6} {rate:>8.2f} "
+                f"{sum(commands.values()):>8} {sum(record['requests'].values()):>9}  {top}"
+            )
+
+
+def count_webdriver_commands(recorder):
+    """Count every command a WebDriver sends (including CDP calls) without changing what it does."""
+    execute = WebDriver.execute
+
+    def counted_execute(self, driver_command, params=None):
+        recorder.count_command(driver_command)
+        return execute(self, driver_command, params)
+
+    WebDriver.execute = counted_execute
+
+
+def check_jobs(name, jobs, expected_by_id, job_id, fields):
+    """Compare scraped jobs with the served postings; returns the number of problems found."""
+    problems = 0
+    seen = set()
+    for job in jobs:
+        key = job_id(job.get("apply_link") or "")
+        expected = expected_by_id.get(key)
+        if expected is None:
+            problems += 1
+            print(f"  {name}: unexpected job {job.get('apply_link')!r}")
+            continue
+        seen.add(key)
+        for field in fields:
+            if job.get(field) != expected[field]:
+                problems += 1
+                print(f"  {name} {key}: {field} {job.get(field)!r} != {expected[field]!r}")
+    missing = set(expected_by_id) - seen
+    if missing:
+        problems += len(missing)
+        print(f"  {name}: {len(missing)} of {len(expected_by_id)} served jobs missing, e.g. {sorted(missing)[:3]}")
+    return problems
+
+
+def triage_recall(job_finder, source, served, criteria, mode):
+    """Prints which share of the served postings card triage in `mode` would open; returns how many it skips."""
+    cards = [{"title": job["job_title"], "company": job["company"], "location": job["location"]} for job in served]
+    keep = job_finder.triage_cards(source, cards, criteria, mode=mode)
+    skipped = sorted({job["job_title"] for job, kept in zip(served, keep) if not kept})
+    print(
+        f"  {source} triage ({mode}): opens {keep.count(True)} of {len(served)} served jobs "
+        f"(recall {keep.count(True) / max(len(served), 1):.2f})" + (f", skips e.g. {skipped[:4]}" if skipped else "")
+    )
+    return keep.count(False)
+
+
+def glassdoor_job_id(apply_link):
+    return parse_qs(urlsplit(apply_link).query).get("jl", [None])[0]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--latency-ms", type=float, default=50, help="delay added to every fake-site response")
+    parser.add_argument("--linkedin-jobs", type=int, default=None, help="serve only the first N golden jobs")
+    parser.add_argument("--glassdoor-jobs", type=int, default=60)
+    parser.add_argument("--json", help="also write the stage records to this file")
+    args = parser.parse_args()
+
+    board = JobBoard(linkedin_jobs=args.linkedin_jobs, glassdoor_jobs=args.glassdoor_jobs)
+    site = FakeJobSite(board, latency=args.latency_ms / 1000).start()
+    os.environ["LINKEDIN_BASE_URL"] = site.base_url
+    os.environ["GLASSDOOR_BASE_URL"] = site.base_url
+    os.environ["JOB_FINDER_CACHE_DIR"] = tempfile.mkdtemp(prefix="job_finder_bench_")
+    print(f"Fake site at {site.base_url}: {len(board.linkedin)} LinkedIn and {len(board.glassdoor)} Glassdoor jobs")
+
+    recorder = StageRecorder(site)
+    count_webdriver_commands(recorder)
+
+    with recorder.stage("import"):
+        import job_finder
+        from fastapi.testclient import TestClient
+
+    criteria = job_finder.JobSearchCriteria(**CRITERIA)
+    problems = 0
+    try:
+        with recorder.stage("model_warmup"):
+            job_finder.warm_embedding_model()
+
+        with recorder.stage("driver_launch") as record:
+            job_finder.driver_pool.warm()
+            record["items"] = job_finder.driver_pool._live
+
+        for source, served in (("linkedin", board.linkedin), ("glassdoor", board.glassdoor)):
+            for mode in dict.fromkeys((job_finder.CARD_TRIAGE, "lexical")):
+                skipped = triage_recall(job_finder, source, served, criteria, mode)
+                if mode == job_finder.CARD_TRIAGE and skipped:
+                    problems += skipped
+                    print(f"  {source}: CARD_TRIAGE={mode} skips {skipped} served jobs")
+
+        with recorder.stage("scrape_linkedin_jobs") as record:
+            linkedin_jobs = job_finder.scrape_linkedin_jobs(criteria)
+            record["items"] = len(linkedin_jobs)
+        problems += check_jobs("linkedin", linkedin_jobs, board.linkedin_by_id, linkedin_job_id, LINKEDIN_FIELDS)
+
+        with recorder.stage("scrape_glassdoor_jobs") as record:
+            glassdoor_jobs = job_finder.scrape_glassdoor_jobs(criteria)
+            record["items"] = len(glassdoor_jobs)
+        problems += check_jobs("glassdoor", glassdoor_jobs, board.glassdoor_by_id, glassdoor_job_id, GLASSDOOR_FIELDS)
+
+        with recorder.stage("dedup") as record:
+            all_jobs = job_finder.dedupe_jobs({"linkedin": linkedin_jobs, "glassdoor": glassdoor_jobs})
+            record["items"] = len(linkedin_jobs) + len(glassdoor_jobs)
+        print(f"{len(all_jobs)} distinct postings among {record['items']} scraped jobs")
+
+        with recorder.stage("relevance_cold") as record:
+            relevant = job_finder.filter_relevant_jobs(all_jobs, criteria)
+            record["items"] = len(all_jobs)
+        with recorder.stage("relevance_warm") as record:
+            relevant_warm = job_finder.filter_relevant_jobs(all_jobs, criteria)
+            record["items"] = len(all_jobs)
+        if relevant_warm != relevant:
+            problems += 1
+            print("  relevance: warm embedding cache changed the relevant set")
+
+        client = TestClient(job_finder.app)
+        with recorder.stage("search_jobs_endpoint") as record:
+            response = client.post("/search_jobs", json=CRITERIA)
+            record["items"] = len(response.json().get("relevant_jobs", [])) if response.status_code == 200 else 0
+        if response.status_code != 200:
+            problems += 1
+            print(f"  /search_jobs: HTTP {response.status_code}")
+        else:
+            expected = {("linkedin", key): job for key, job in board.linkedin_by_id.items()}
+            expected.update({("glassdoor", key): job for key, job in board.glassdoor_by_id.items()})
+            for job in response.json()["relevant_jobs"]:
+                link = job["apply_link"]
+                key = ("linkedin", linkedin_job_id(link)) if linkedin_job_id(link) else ("glassdoor", glassdoor_job_id(link))
+                served = expected.get(key)
+                if served is None or (job["job_title"], job["company"]) != (served["job_title"], served["company"]):
+                    problems += 1
+                    print(f"  /search_jobs: job does not match a served posting: {job!r}")
+            print(f"/search_jobs returned {record['items']} relevant jobs ({len(relevant)} from the relevance stage)")
+    finally:
+        job_finder.driver_pool.shutdown()
+        site.stop()
+
+    recorder.report()
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"latency_ms": args.latency_ms, "stages": recorder.stages}, f, indent=1)
+    if problems:
+        sys.exit(f"{problems} correctness problem(s) against the golden jobs")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""Import-time budget for job_finder.py, and time until the lifespan warm-up reports ready.
+
+Imports job_finder in fresh interpreters and fails when the median import time exceeds --budget-ms, or when a
+module that should load lazily (the embedding stack, webdriver_manager) is imported at module level. The direct
+imports that cost the most, from python -X importtime, show where the time goes. With --ready it also runs the
+app lifespan and reports how long GET /ready takes to return 200 and how long each warm-up step took.
+
+    python benchmarks/bench_startup.py [--budget-ms 1500] [--runs 5] [--ready] [--ready-timeout 120]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+LAZY_MODULES = ("sentence_transformers", "torch", "transformers", "scipy", "onnxruntime", "webdriver_manager")
+
+IMPORT_PROBE = """
+import json, sys, time
+started = time.perf_counter()
+import job_finder
+seconds = time.perf_counter() - started
+lazy = %r
+print(json.dumps({"seconds": seconds, "eager": sorted(name for name in lazy if name in sys.modules)}))
+""" % (LAZY_MODULES,)
+
+
+def run_probe(extra_args=()):
+    result = subprocess.run(
+        [sys.executable, *extra_args, "-c", IMPORT_PROBE], cwd=ROOT, capture_output=True, text=True, check=True
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1]), result.stderr
+
+
+def direct_imports(importtime_log, top):
+    """(cumulative ms, module) for the modules job_finder imports directly, most expensive first."""
+    rows = []
+    for line in importtime_log.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if name.startswith("   ") and not name.startswith("    ") and cumulative.strip().isdigit():
+            rows.append((int(cumulative) / 1000, name.strip()))
+    return sorted(rows, reverse=True)[:top]
+
+
+def time_to_ready(timeout):
+    sys.path.insert(0, ROOT)
+    from fastapi.testclient import TestClient
+    import job_finder
+
+    started = time.perf_counter()
+    with TestClient(job_finder.app) as client:
+        while True:
+            response = client.get("/ready")
+            state = response.json()
+            failed = [name for name, status in state["components"].items() if status["status"] == "failed"]
+            if response.status_code == 200 or failed or time.perf_counter() - started > timeout:
+                return time.perf_counter() - started, response.status_code, state
+            time.sleep(0.1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--budget-ms", type=float, default=1500, help="largest acceptable median import time")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=8, help="how many direct imports to list")
+    parser.add_argument("--ready", action="store_true", help="also time the lifespan warm-up until GET /ready is 200")
+    parser.add_argument("--ready-timeout", type=float, default=120)
+    args = parser.parse_args()
+
+    problems = []
+    samples = []
+    for _ in range(args.runs):
+        probe, _ = run_probe()
+        samples.append(probe["seconds"] * 1000)
+    median = statistics.median(samples)
+    print(f"import job_finder: median {median:.0f} ms, min {min(samples):.0f} ms over {args.runs} runs (budget {args.budget_ms:.0f} ms)")
+    if median > args.budget_ms:
+        problems.append(f"median import time {median:.0f} ms is over the {args.budget_ms:.0f} ms budget")
+    if probe["eager"]:
+        problems.append(f"imported at module level but should load lazily: {', '.join(probe['eager'])}")
+
+    _, log = run_probe(["-X", "importtime"])
+    print(f"\n{'cumulative ms':>13}  direct import")
+    for milliseconds, name in direct_imports(log, args.top):
+        print(f"{milliseconds:>13.1f}  {name}")
+
+    if args.ready:
+        seconds, status_code, state = time_to_ready(args.ready_timeout)
+        print(f"\nGET /ready returned {status_code} after {seconds:.2f} s")
+        for name, status in state["components"].items():
+            print(f"  {name:<16} {status['status']:<8} {status.get('seconds', '')} {status.get('error', '')}")
+        if status_code != 200:
+            problems.append("the app did not become ready")
+
+    for problem in problems:
+        print(f"  {problem}")
+    if problems:
+        sys.exit(f"{len(problems)} startup problem(s)")
+
+
+if __name__ == "__main__":
+    main()
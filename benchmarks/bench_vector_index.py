@@ -0,0 +1,113 @@
+"""Recall and query latency of the job corpus VectorIndex: IVF against the exact scan, on a fixed seed.
+
+Builds clustered, normalized vectors of the embedding size (MiniLM's 384 dimensions), with a few hundred
+topics and noisy members standing in for postings. Queries are perturbed postings. For each corpus size the
+exact scan (an index that never trains IVF) gives the true top k. The IVF index is then timed against it at
+every --nprobe (0 is the index default), without a filter and with a mask that keeps about a quarter of the
+rows, the way the source and location filters do. Reports recall@k, median and p95 ms per query, and the speedup
+over the exact scan. Fails when the default configuration's recall is below --min-recall; fixed probe counts
+are reported for comparison only.
+
+    python benchmarks/bench_vector_index.py [--sizes 5000,50000] [--nprobe 8,16,0] [--queries 200] [--k 10] [--json out.json]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+import job_finder
+
+DIM = 384
+
+
+def clustered_vectors(rng, count, topics, noise=0.35):
+    centers = rng.standard_normal((topics, DIM)).astype(np.float32)
+    members = centers[rng.integers(0, topics, count)] + noise * rng.standard_normal((count, DIM)).astype(np.float32)
+    return members / np.linalg.norm(members, axis=1, keepdims=True)
+
+
+def build(vectors, min_ivf_items, nprobe):
+    index = job_finder.VectorIndex(min_ivf_items=min_ivf_items, nprobe=nprobe)
+    for vector in vectors:
+        index.add(vector)
+    return index
+
+
+def run_queries(index, queries, k, mask):
+    results = []
+    seconds = []
+    for query in queries:
+        started = time.perf_counter()
+        hits = index.search(query, k, mask)
+        seconds.append(time.perf_counter() - started)
+        results.append([slot for slot, _ in hits])
+    milliseconds = np.array(seconds) * 1000
+    return results, float(np.median(milliseconds)), float(np.percentile(milliseconds, 95))
+
+
+def recall(results, truth, k):
+    return float(np.mean([
+        len(set(found) & set(expected)) / max(min(k, len(expected)), 1) for found, expected in zip(results, truth)
+    ]))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="5000,50000", help="comma-separated corpus sizes")
+    parser.add_argument("--nprobe", default="8,16,0", help="comma-separated IVF probe counts (0: the default, a sixth of the lists)")
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--min-recall", type=float, default=0.95)
+    parser.add_argument("--json", help="also write the results to this file")
+    args = parser.parse_args()
+
+    probes = list(dict.fromkeys(int(value) for value in args.nprobe.split(",")))
+    rows = []
+    failures = 0
+    print(f"{'size':>7} {'filter':>7} {'index':>10} {'recall@k':>9} {'p50 ms':>8} {'p95 ms':>8} {'speedup':>8}")
+    for size in (int(value) for value in args.sizes.split(",")):
+        rng = np.random.default_rng(args.seed)
+        vectors = clustered_vectors(rng, size, topics=max(size // 100, 10))
+        picks = rng.choice(size, args.queries, replace=False)
+        queries = vectors[picks] + 0.2 * rng.standard_normal((args.queries, DIM)).astype(np.float32)
+        queries /= np.linalg.norm(queries, axis=1, keepdims=True)
+        quarter = rng.random(size) < 0.25
+
+        exact = build(vectors, min_ivf_items=size + 1, nprobe=1)
+        ivf = build(vectors, min_ivf_items=min(job_finder.IVF_MIN_ITEMS, size), nprobe=0)
+        for label, mask in (("none", None), ("25%", quarter)):
+            truth, exact_p50, exact_p95 = run_queries(exact, queries, args.k, mask)
+            rows.append({"size": size, "filter": label, "index": "exact", "recall": 1.0, "p50_ms": exact_p50, "p95_ms": exact_p95})
+            print(f"{size:>7} {label:>7} {'exact':>10} {1.0:>9.3f} {exact_p50:>8.2f} {exact_p95:>8.2f} {1.0:>7.1f}x")
+            for nprobe in probes:
+                ivf.nprobe = nprobe
+                results, p50, p95 = run_queries(ivf, queries, args.k, mask)
+                row = {
+                    "size": size, "filter": label, "index": f"ivf/{nprobe or 'auto'}", "lists": len(ivf.centroids),
+                    "recall": recall(results, truth, args.k), "p50_ms": p50, "p95_ms": p95,
+                }
+                rows.append(row)
+                line = (
+                    f"{size:>7} {label:>7} {row['index']:>10} {row['recall']:>9.3f} {p50:>8.2f} {p95:>8.2f} "
+                    f"{exact_p50 / p50:>7.1f}x"
+                )
+                if nprobe == 0 and row["recall"] < args.min_recall:
+                    failures += 1
+                    line += "  BELOW MIN RECALL"
+                print(line)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"k": args.k, "seed": args.seed, "results": rows}, f, indent=1)
+    if failures:
+        sys.exit(f"The default IVF configuration is below recall {args.min_recall} in {failures} case(s)")
+
+
+if __name__ == "__main__":
+    main()
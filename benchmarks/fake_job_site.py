@@ -0,0 +1,415 @@
+"""Local stand-in for the LinkedIn and Glassdoor pages the scrapers read.
+
+Serves search listings, job detail panes and job pages built from the jobs in "Linkedin Response.txt",
+with the DOM structure our selectors expect (div.job-search-card, a.base-card__full-link,
+h2.top-card-layout__title, li[data-test='jobListing'], h1#jd-job-title-<id>, ...). Listings load more
+cards on scroll (LinkedIn) or through a load-more button (Glassdoor), like the live sites, and every
+response is delayed by a configurable latency.
+
+Point the API at it with LINKEDIN_BASE_URL and GLASSDOOR_BASE_URL:
+
+    python benchmarks/fake_job_site.py --port 8800 [--latency-ms 50]
+"""
+import argparse
+import html
+import json
+import os
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+GOLDEN_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Linkedin Response.txt")
+
+LINKEDIN_PAGE_SIZE = 25
+GLASSDOOR_PAGE_SIZE = 30
+GLASSDOOR_LOCATION_ID = 1127408
+
+SKILL_SETS = [
+    ["SQL", "Python", "Power BI", "Excel"],
+    ["SQL", "Tableau", "statistics", "A/B testing"],
+    ["Python", "pandas", "data modelling", "ETL pipelines"],
+    ["Excel", "Google Sheets", "reporting", "stakeholder management"],
+]
+
+
+def load_golden(path=GOLDEN_PATH):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)["jobs"]
+
+
+def linkedin_job_id(apply_link):
+    match = re.search(r"/jobs/view/[^?]*?-(\d+)(?:[/?]|$)", apply_link)
+    return match.group(1) if match else None
+
+
+def description_html(job, index):
+    skills = SKILL_SETS[index % len(SKILL_SETS)]
+    items = "".join(f"<li>Hands-on experience with {html.escape(skill)}</li>" for skill in skills)
+    return (
+        f"<strong>About the role</strong><br><br>{html.escape(job['company'])} is hiring a "
+        f"{html.escape(job['job_title'])} in {html.escape(job['location'])}. You will turn raw operational data "
+        f"into dashboards, reports and recommendations used across the business.<br><br>"
+        f"<strong>Requirements</strong><ul><li>2+ years of experience in a data role</li>{items}</ul>"
+        f"<p>Benefits include health insurance and a learning budget.</p>"
+    )
+
+
+class JobBoard:
+    """The jobs served by the fake site, one LinkedIn and one Glassdoor view of the same postings."""
+
+    def __init__(self, golden=None, linkedin_jobs=None, glassdoor_jobs=None):
+        golden = golden if golden is not None else load_golden()
+        self.linkedin = []
+        for index, job in enumerate(golden[:linkedin_jobs]):
+            parts = urlsplit(job["apply_link"])
+            self.linkedin.append({
+                **job,
+                "id": linkedin_job_id(job["apply_link"]),
+                "path": parts.path + (f"?{parts.query}" if parts.query else ""),
+                "description_html": description_html(job, index),
+            })
+        self.glassdoor = []
+        for index, job in enumerate(golden[:glassdoor_jobs]):
+            job_id = str(1009000000 + index)
+            slug = re.sub(r"[^a-z0-9]+", "-", f"{job['job_title']} {job['company']}".lower()).strip("-")
+            self.glassdoor.append({
+                **job,
+                "id": job_id,
+                "path": f"/job-listing/{slug}-JV_KO0,{len(slug)}.htm?jl={job_id}",
+                "salary": f"PKR {70 + 5 * (index % 8)}K - {120 + 10 * (index % 5)}K (Employer est.)",
+                "description_html": description_html(job, index + 1),
+            })
+        self.linkedin_by_id = {job["id"]: job for job in self.linkedin}
+        self.glassdoor_by_id = {job["id"]: job for job in self.glassdoor}
+
+
+# ================= LinkedIn pages =================
+LINKEDIN_SEARCH_JS = """
+let start = %(page_size)d;
+let loading = false;
+const cards = document.getElementById("job-cards");
+const pane = document.getElementById("details-pane");
+window.addEventListener("scroll", () => {
+    if (loading || start >= %(total)d) return;
+    if (window.innerHeight + window.scrollY < document.body.scrollHeight - 200) return;
+    loading = true;
+    fetch("/jobs-guest/jobs/api/seeMoreJobPostings/search" + window.location.search.replace(/^\\?/, "?start=" + start + "&"))
+        .then(response => response.text())
+        .then(markup => { cards.insertAdjacentHTML("beforeend", markup); start += %(page_size)d; loading = false; });
+});
+document.addEventListener("click", event => {
+    const dismiss = event.target.closest("button.modal__dismiss");
+    if (dismiss) {
+        document.getElementById("sign-in-modal").style.display = "none";
+        return;
+    }
+    const more = event.target.closest("button.show-more-less-html__button");
+    if (more) {
+        more.setAttribute("aria-expanded", "true");
+        more.textContent = "Show less";
+        return;
+    }
+    const link = event.target.closest("a.base-card__full-link");
+    if (!link) return;
+    event.preventDefault();
+    pane.innerHTML = "";
+    const id = link.closest("div.job-search-card").dataset.entityUrn.split(":").pop();
+    fetch("/jobs-guest/jobs/api/jobPosting/" + id)
+        .then(response => response.text())
+        .then(markup => { pane.innerHTML = markup; });
+});
+"""
+
+PAGE_STYLE = """
+body { font-family: sans-serif; margin: 0; }
+.modal { position: fixed; inset: 0; background: rgba(0, 0, 0, 0.5); z-index: 10; }
+.modal__content { background: #fff; width: 400px; margin: 120px auto; padding: 24px; }
+.results { display: flex; }
+.results > ul, .results > ol { width: 40%; list-style: none; margin: 0; padding: 0; }
+.job-search-card, li[data-test='jobListing'] { min-height: 140px; border-bottom: 1px solid #ddd; padding: 8px; }
+.details { position: sticky; top: 0; width: 60%; height: 100vh; overflow: auto; padding: 16px; }
+.show-more-less-html__markup, .JobDetails_jobDescription__uW_fK > div { max-height: 120px; overflow: hidden; }
+[aria-expanded='true'] { color: #555; }
+"""
+
+
+def page(title, body, script=""):
+    return (
+        f"<!DOCTYPE html><html lang=\"en\"><head><meta charset=\"utf-8\"><title>{html.escape(title)}</title>"
+        f"<style>{PAGE_STYLE}</style></head><body>{body}<script>{script}</script></body></html>"
+    )
+
+
+def linkedin_card(job, position):
+    return (
+        f'<li><div class="base-card relative w-full base-card--link base-search-card base-search-card--link job-search-card" '
+        f'data-entity-urn="urn:li:jobPosting:{job["id"]}">'
+        f'<a class="base-card__full-link" href="{html.escape(job["path"])}" '
+        f'data-tracking-control-name="public_jobs_jserp-result_search-card">'
+        f'<span class="sr-only">{html.escape(job["job_title"])}</span></a>'
+        f'<div class="base-search-card__info"><h3 class="base-search-card__title">{html.escape(job["job_title"])}</h3>'
+        f'<h4 class="base-search-card__subtitle">{html.escape(job["company"])}</h4>'
+        f'<div class="base-search-card__metadata"><span class="job-search-card__location">{html.escape(job["location"])}</span>'
+        f'<time class="job-search-card__listdate">{position % 7 + 1} days ago</time></div></div></div></li>'
+    )
+
+
+def linkedin_cards(board, start):
+    jobs = board.linkedin[start:start + LINKEDIN_PAGE_SIZE]
+    return "".join(linkedin_card(job, start + offset) for offset, job in enumerate(jobs))
+
+
+def linkedin_top_card(job):
+    return (
+        f'<section class="top-card-layout container-lined overflow-hidden">'
+        f'<div class="top-card-layout__entity-info-container"><div class="top-card-layout__entity-info">'
+        f'<a href="{html.escape(job["path"])}" class="topcard__link">'
+        f'<h2 class="top-card-layout__title font-sans text-lg topcard__title">{html.escape(job["job_title"])}</h2></a>'
+        f'<h4 class="top-card-layout__second-subline"><div class="topcard__flavor-row">'
+        f'<span class="topcard__flavor"><a class="topcard__org-name-link topcard__flavor--black-link" href="/company/x">'
+        f'{html.escape(job["company"])}</a></span>'
+        f'<span class="topcard__flavor topcard__flavor--bullet">{html.escape(job["location"])}</span></div></h4>'
+        f'</div></div></section>'
+        f'<section class="core-section-container my-3 description"><div class="core-section-container__content break-words">'
+        f'<div class="description__text description__text--rich"><section class="show-more-less-html" data-max-lines="5">'
+        f'<div class="show-more-less-html__markup show-more-less-html__markup--clamp-after-5 relative overflow-hidden">'
+        f'{job["description_html"]}</div>'
+        f'<button class="show-more-less-html__button show-more-less-button show-more-less-html__button--more" '
+        f'aria-expanded="false" data-tracking-control-name="public_jobs_show-more-html-btn">Show more</button>'
+        f'</section></div></div></section>'
+    )
+
+
+def linkedin_search_page(board, query):
+    keywords = query.get("keywords", [""])[0]
+    body = (
+        '<div class="modal" id="sign-in-modal"><div class="modal__content"><p>Sign in to see more jobs</p>'
+        '<button class="modal__dismiss" aria-label="Dismiss" '
+        'data-tracking-control-name="public_jobs_contextual-sign-in-modal_modal_dismiss">Dismiss</button></div></div>'
+        f'<h1>{len(board.linkedin)} {html.escape(keywords)} jobs</h1>'
+        f'<div class="results"><ul class="jobs-search__results-list" id="job-cards">{linkedin_cards(board, 0)}</ul>'
+        '<div class="details" id="details-pane"></div></div>'
+    )
+    script = LINKEDIN_SEARCH_JS % {"page_size": LINKEDIN_PAGE_SIZE, "total": len(board.linkedin)}
+    return page(f"{keywords} jobs", body, script)
+
+
+def linkedin_job_page(job):
+    script = """
+document.addEventListener("click", event => {
+    const more = event.target.closest("button.show-more-less-html__button");
+    if (more) { more.setAttribute("aria-expanded", "true"); more.textContent = "Show less"; }
+});
+"""
+    return page(job["job_title"], f'<main class="main" id="main-content">{linkedin_top_card(job)}</main>', script)
+
+
+# ================= Glassdoor pages =================
+GLASSDOOR_SEARCH_JS = """
+let page = 1;
+const list = document.querySelector("ul[aria-label='Jobs List']");
+const pane = document.getElementById("details-pane");
+const loadMore = document.querySelector("button[data-test='load-more-jobs']");
+document.addEventListener("click", event => {
+    if (event.target.closest("button#onetrust-accept-btn-handler")) {
+        document.getElementById("onetrust-banner-sdk").remove();
+        return;
+    }
+    if (event.target.closest("button[data-test='load-more-jobs']")) {
+        page += 1;
+        fetch(window.location.pathname.replace(/(_IP\\d+)?\\.htm$/, "_IP" + page + ".htm") + "?fragment=cards")
+            .then(response => response.text())
+            .then(markup => {
+                list.insertAdjacentHTML("beforeend", markup);
+                if (page * %(page_size)d >= %(total)d) loadMore.style.display = "none";
+            });
+        return;
+    }
+    const more = event.target.closest("button[data-test='show-more-cta']");
+    if (more) {
+        more.setAttribute("aria-expanded", "true");
+        more.textContent = "Show less";
+        return;
+    }
+    const card = event.target.closest("li[data-test='jobListing']");
+    if (!card) return;
+    event.preventDefault();
+    pane.innerHTML = "";
+    const link = card.querySelector("a[data-test='job-title']");
+    fetch("/job-listing/api/" + card.dataset.jobid)
+        .then(response => response.text())
+        .then(markup => { pane.innerHTML = markup; history.replaceState(null, "", link.getAttribute("href")); });
+});
+"""
+
+
+def glassdoor_card(job):
+    return (
+        f'<li class="JobsList_jobListItem__wjTHv" data-test="jobListing" data-jobid="{job["id"]}">'
+        f'<div class="JobCard_jobCardContainer__arQlW"><div class="JobCard_jobCardLeftContent__3PDn9">'
+        f'<span class="EmployerProfile_compactEmployerName__9MGcV">{html.escape(job["company"])}</span>'
+        f'<a class="JobCard_jobTitle__GLyJ1" data-test="job-title" href="{html.escape(job["path"])}">{html.escape(job["job_title"])}</a>'
+        f'<div class="JobCard_location__Ds1fM" data-test="emp-location">{html.escape(job["location"])}</div>'
+        f'<div class="JobCard_salaryEstimate__QpbTW">{html.escape(job["salary"])}</div>'
+        f'</div></div></li>'
+    )
+
+
+def glassdoor_cards(board, page_number):
+    start = (page_number - 1) * GLASSDOOR_PAGE_SIZE
+    return "".join(glassdoor_card(job) for job in board.glassdoor[start:start + GLASSDOOR_PAGE_SIZE])
+
+
+def glassdoor_details(job):
+    return (
+        f'<div class="JobDetails_jobDetailsContainer__y9P3L">'
+        f'<header class="JobDetails_jobDetailsHeader__Hd9M3">'
+        f'<div class="EmployerProfile_profileContainer__63w3R"><h4 class="heading_Subhead__Ip1aW">{html.escape(job["company"])}</h4></div>'
+        f'<h1 class="heading_Heading__BqX5J heading_Level1__soLZs" id="jd-job-title-{job["id"]}">{html.escape(job["job_title"])}</h1>'
+        f'<div class="JobDetails_location__mSg5h" data-test="location">{html.escape(job["location"])}</div>'
+        f'<div class="SalaryEstimate_salaryRange__brHFy" data-test="detailSalary">{html.escape(job["salary"])}</div>'
+        f'</header><section><div class="JobDetails_jobDescription__uW_fK JobDetails_blurDescription__vN7nh">'
+        f'<div>{job["description_html"]}</div></div>'
+        f'<button class="JobDetails_showMore___Le6L" data-test="show-more-cta" aria-expanded="false" type="button">'
+        f'Show more</button></section></div>'
+    )
+
+
+def glassdoor_search_page(board, page_number):
+    load_more = "" if page_number * GLASSDOOR_PAGE_SIZE >= len(board.glassdoor) else (
+        '<button class="button_Button__MlD2g" data-test="load-more-jobs" type="button">Show more jobs</button>'
+    )
+    body = (
+        '<div id="onetrust-banner-sdk"><p>We use cookies.</p>'
+        '<button id="onetrust-accept-btn-handler">Accept Cookies</button></div>'
+        f'<h1>{len(board.glassdoor)} jobs</h1><div class="results TwoColumnLayout_container___jk7P">'
+        f'<div class="TwoColumnLayout_columnLeft__BQhTl"><ul class="JobsList_jobsList__lqjTr" aria-label="Jobs List">'
+        f'{glassdoor_cards(board, page_number)}</ul>{load_more}</div>'
+        '<div class="details TwoColumnLayout_columnRight__GRvqO" id="details-pane"></div></div>'
+    )
+    script = GLASSDOOR_SEARCH_JS % {"page_size": GLASSDOOR_PAGE_SIZE, "total": len(board.glassdoor)}
+    return page("Glassdoor jobs", body, script)
+
+
+def glassdoor_job_page(job):
+    script = """
+document.addEventListener("click", event => {
+    const more = event.target.closest("button[data-test='show-more-cta']");
+    if (more) { more.setAttribute("aria-expanded", "true"); more.textContent = "Show less"; }
+});
+"""
+    body = f'<div class="TwoColumnLayout_jobDetailsContainer__qyvJZ">{glassdoor_details(job)}</div>'
+    return page(job["job_title"], body, script)
+
+
+# ================= Server =================
+class FakeJobSite:
+    """Threaded HTTP server for a JobBoard; counts requests per route."""
+
+    def __init__(self, board=None, host="127.0.0.1", port=0, latency=0.05):
+        self.board = board or JobBoard()
+        self.latency = latency
+        self.requests = {}
+        self._lock = threading.Lock()
+        self.server = ThreadingHTTPServer((host, port), self._handler())
+        self.server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def count(self, route):
+        with self._lock:
+            self.requests[route] = self.requests.get(route, 0) + 1
+
+    def route(self, path, query):
+        """Return (route name, status, content type, body) for a request."""
+        board = self.board
+        if path == "/jobs/search/" or path == "/jobs/search":
+            return "linkedin.search", 200, "text/html", linkedin_search_page(board, query)
+        if path == "/jobs-guest/jobs/api/seeMoreJobPostings/search":
+            start = int(query.get("start", ["0"])[0])
+            return "linkedin.search_page", 200, "text/html", linkedin_cards(board, start)
+        match = re.fullmatch(r"/jobs-guest/jobs/api/jobPosting/(\d+)", path)
+        if match and match.group(1) in board.linkedin_by_id:
+            return "linkedin.detail_pane", 200, "text/html", linkedin_top_card(board.linkedin_by_id[match.group(1)])
+        job_id = linkedin_job_id(path)
+        if path.startswith("/jobs/view/") and job_id in board.linkedin_by_id:
+            return "linkedin.job_page", 200, "text/html", linkedin_job_page(board.linkedin_by_id[job_id])
+        if path == "/findPopularLocationAjax.htm":
+            term = query.get("term", [""])[0]
+            payload = [{"locationId": GLASSDOOR_LOCATION_ID, "label": term, "locationType": "N"}] if term else []
+            return "glassdoor.location", 200, "application/json", json.dumps(payload)
+        match = re.fullmatch(r"/Job/[^/]*-jobs-SRCH_[^/]*?(?:_IP(\d+))?\.htm", path)
+        if match:
+            page_number = int(match.group(1) or 1)
+            if query.get("fragment") == ["cards"]:
+                return "glassdoor.search_page", 200, "text/html", glassdoor_cards(board, page_number)
+            return "glassdoor.search", 200, "text/html", glassdoor_search_page(board, page_number)
+        match = re.fullmatch(r"/job-listing/api/(\d+)", path)
+        if match and match.group(1) in board.glassdoor_by_id:
+            return "glassdoor.detail_pane", 200, "text/html", glassdoor_details(board.glassdoor_by_id[match.group(1)])
+        job_id = query.get("jl", [None])[0]
+        if path.startswith("/job-listing/") and job_id in board.glassdoor_by_id:
+            return "glassdoor.job_page", 200, "text/html", glassdoor_job_page(board.glassdoor_by_id[job_id])
+        return "not_found", 404, "text/plain", "Not found"
+
+    def _handler(self):
+        site = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                parts = urlsplit(self.path)
+                route, status, content_type, body = site.route(parts.path, parse_qs(parts.query))
+                site.count(route)
+                if site.latency:
+                    time.sleep(site.latency)
+                payload = body.encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", f"{content_type}; charset=utf-8")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def start(self):
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8800)
+    parser.add_argument("--latency-ms", type=float, default=50)
+    parser.add_argument("--linkedin-jobs", type=int, default=None, help="serve only the first N golden jobs")
+    parser.add_argument("--glassdoor-jobs", type=int, default=60)
+    args = parser.parse_args()
+
+    board = JobBoard(linkedin_jobs=args.linkedin_jobs, glassdoor_jobs=args.glassdoor_jobs)
+    site = FakeJobSite(board, args.host, args.port, args.latency_ms / 1000)
+    print(f"Serving {len(board.linkedin)} LinkedIn and {len(board.glassdoor)} Glassdoor jobs at {site.base_url}")
+    print(f"LINKEDIN_BASE_URL={site.base_url} GLASSDOOR_BASE_URL={site.base_url}")
+    try:
+        site.server.serve_forever()
+    except KeyboardInterrupt:
+        site.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,7 @@
-from fastapi import FastAPI
-from pydantic import BaseModel
+from fastapi import FastAPI, Query, HTTPException
+from fastapi.responses import StreamingResponse, JSONResponse, PlainTextResponse
+from pydantic import BaseModel, Field
+from typing import Optional
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.common.by import By
@@ -8,15 +10,51 @@ from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, ElementClickInterceptedException
 from selenium.webdriver.common.action_chains import ActionChains
 from selenium.webdriver.common.keys import Keys
-from webdriver_manager.chrome import ChromeDriverManager
 from bs4 import BeautifulSoup
-from urllib.parse import urlencode
-from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlencode, urljoin, urlsplit
+from concurrent.futures import ThreadPoolExecutor, Future, FIRST_EXCEPTION, wait
 from selenium.webdriver.chrome.options import Options
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import time
-
-app = FastAPI()
+import os
+import queue
+import threading
+import contextlib
+import functools
+import collections
+import hashlib
+import sqlite3
+import json
+import re
+import uuid
+import contextvars
+import bisect
+import itertools
+import math
+import numpy as np
+try:
+    import lxml.html
+except ImportError:
+    lxml = None
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+@contextlib.asynccontextmanager
+async def lifespan(app):
+    """Warm the embedding model and the browser pool in the background; GET /ready turns 200 once both are done."""
+    startup_state.start({"embedding_model": warm_embedding_model, "browser_pool": warm_browser_pool})
+    threading.Thread(target=maintain_browsers, daemon=True, name="browser-maintenance").start()
+    yield
+    browser_maintenance_stop.set()
+    search_tasks.shutdown()
+    driver_pool.shutdown()
+    browser_processes.kill_all()
+
+app = FastAPI(lifespan=lifespan)
 
 class JobSearchCriteria(BaseModel):
     position: str
@@ -25,378 +63,981 @@ class JobSearchCriteria(BaseModel):
     jobNature: str
     location: str
     skills: str
+    # Optional budget: stop after `limit` relevant jobs or after `deadline_ms`, and return what finished as partial.
+    limit: Optional[int] = Field(None, gt=0)
+    deadline_ms: Optional[int] = Field(None, gt=0)
+    min_score: Optional[float] = Field(None, ge=-1, le=1)
 
-# ================= LinkedIn Logic (Unchanged) =================
-def close_linkedin_modal(driver):
-    selectors = [
-        "button[data-tracking-control-name='public_jobs_contextual-sign-in-modal_modal_dismiss']",
-        "button.modal__dismiss",
-        "button[aria-label='Dismiss']"
-    ]
-    for selector in selectors:
-        try:
-            btn = WebDriverWait(driver, 10).until(
-                EC.element_to_be_clickable((By.CSS_SELECTOR, selector))
-            )
-            btn.click()
-            time.sleep(1)
-            return True
-        except TimeoutException:
-            continue
-    try:
-        ActionChains(driver).send_keys(Keys.ESCAPE).perform()
-        time.sleep(1)
-        return True
-    except Exception:
-        return False
-
-def wait_until_all_jobs_loaded(driver, card_selector="div.job-search-card", max_wait=60):
-    start_time = time.time()
-    prev_count = -1
-    while True:
-        cards = driver.find_elements(By.CSS_SELECTOR, card_selector)
-        curr_count = len(cards)
-        driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-        try:
-            WebDriverWait(driver, 10).until(
-                lambda d: len(d.find_elements(By.CSS_SELECTOR, card_selector)) > curr_count
-            )
-        except TimeoutException:
-            pass
-        if curr_count == prev_count or (time.time() - start_time) > max_wait:
-            break
-        prev_count = curr_count
-
-def extract_linkedin_job_details(driver, job_link_element, criteria):
-    try:
-        driver.execute_script("arguments[0].scrollIntoView();", job_link_element)
-        ActionChains(driver).move_to_element(job_link_element).perform()
-        job_link_element.click()
-    except ElementClickInterceptedException:
-        driver.execute_script("window.scrollBy(0, 100);")
-        time.sleep(1)
-        job_link_element.click()
-
-    try:
-        WebDriverWait(driver, 55).until(
-            EC.presence_of_element_located((By.CSS_SELECTOR, "h2.top-card-layout__title"))
-        )
-    except TimeoutException:
-        return None
+# Initialize LLM model
+EMBEDDING_MODEL_NAME = 'all-MiniLM-L6-v2'
+# torch (default), onnx or onnx-int8. The ONNX backends need sentence-transformers>=3.2 and optimum[onnxruntime].
+EMBEDDING_BACKEND = os.getenv("EMBEDDING_BACKEND", "torch")
+# The ONNX backends are experimental: they load only with EMBEDDING_EXPERIMENTAL=1, once
+# benchmarks/bench_embedding_backends.py has passed for them on the target host.
+EMBEDDING_EXPERIMENTAL = os.getenv("EMBEDDING_EXPERIMENTAL", "0") == "1"
+EXPERIMENTAL_EMBEDDING_BACKENDS = {"onnx", "onnx-int8"}
+EMBEDDING_THREADS = int(os.getenv("EMBEDDING_THREADS", "0"))  # intra-op threads; 0 keeps the runtime default
+EMBEDDING_ONNX_FILES = {
+    "onnx": "onnx/model.onnx",
+    "onnx-int8": os.getenv("EMBEDDING_INT8_FILE", "onnx/model_quint8_avx2.onnx"),
+}
+
+def load_torch_model(threads=EMBEDDING_THREADS):
+    from sentence_transformers import SentenceTransformer
+    if threads:
+        import torch
+        torch.set_num_threads(threads)  # process-wide
+    return SentenceTransformer(EMBEDDING_MODEL_NAME, device="cpu")
+
+def load_onnx_model(backend, threads=EMBEDDING_THREADS):
+    """The same model run by onnxruntime on CPU, from the ONNX export (or its int8 quantization) on the Hub."""
+    import onnxruntime
+    from sentence_transformers import SentenceTransformer
+    session_options = onnxruntime.SessionOptions()
+    if threads:
+        session_options.intra_op_num_threads = threads
+        session_options.inter_op_num_threads = 1
+    return SentenceTransformer(
+        EMBEDDING_MODEL_NAME,
+        device="cpu",
+        backend="onnx",
+        model_kwargs={
+            "file_name": EMBEDDING_ONNX_FILES[backend],
+            "provider": "CPUExecutionProvider",
+            "session_options": session_options,
+        },
+    )
 
-    try:
-        show_more_btn = WebDriverWait(driver, 10).until(
-            EC.element_to_be_clickable(
-                (By.CSS_SELECTOR, "button.show-more-less-html__button.show-more-less-button[aria-expanded='false']"))
-        )
-        driver.execute_script("arguments[0].scrollIntoView();", show_more_btn)
-        show_more_btn.click()
-        WebDriverWait(driver, 20).until(
-            EC.presence_of_element_located(
-                (By.CSS_SELECTOR, "button.show-more-less-html__button.show-more-less-button[aria-expanded='true']"))
+EMBEDDING_BACKENDS = {
+    "torch": load_torch_model,
+    "onnx": lambda threads=EMBEDDING_THREADS: load_onnx_model("onnx", threads),
+    "onnx-int8": lambda threads=EMBEDDING_THREADS: load_onnx_model("onnx-int8", threads),
+}
+
+def load_embedding_model(backend=EMBEDDING_BACKEND, threads=EMBEDDING_THREADS, experimental=EMBEDDING_EXPERIMENTAL):
+    if backend not in EMBEDDING_BACKENDS:
+        raise ValueError(f"Unknown embedding backend {backend!r}, expected one of: {', '.join(EMBEDDING_BACKENDS)}")
+    if backend in EXPERIMENTAL_EMBEDDING_BACKENDS and not experimental:
+        raise ValueError(
+            f"The {backend} embedding backend is experimental; set EMBEDDING_EXPERIMENTAL=1 to use it, "
+            "after benchmarks/bench_embedding_backends.py passes for it on this host"
         )
-    except TimeoutException:
-        pass
-
-    soup = BeautifulSoup(driver.page_source, "html.parser")
-    title_tag = soup.find("h2", class_="top-card-layout__title")
-    job_title = title_tag.get_text(strip=True) if title_tag else criteria.position
-    company_tag = soup.find("span", class_="topcard__flavor")
-    if not company_tag:
-        company_tag = soup.find("a", class_="topcard__org-name-link topcard__flavor--black-link")
-    company_name = company_tag.get_text(strip=True) if company_tag else ""
-    location_tag = soup.find("span", class_="topcard__flavor topcard__flavor--bullet")
-    location = location_tag.get_text(strip=True) if location_tag else criteria.location
-    apply_link = job_link_element.get_attribute('href')
-    description_tag = soup.find("div", class_="description__text description__text--rich")
-    job_description = description_tag.get_text(separator="\n", strip=True) if description_tag else ""
-
-    return {
-        "job_title": job_title,
-        "company": company_name,
-        "experience": criteria.experience,
-        "description": job_description,
-        "jobNature": criteria.jobNature,
-        "location": location,
-        "salary": criteria.salary,
-        "apply_link": apply_link,
-    }
-
-def scrape_linkedin_jobs(criteria):
-    options = Options()
-    options.add_argument("--disable-notifications")
-    options.add_argument("--disable-popup-blocking")
-    options.add_argument("--start-maximized")
-    options.add_argument("user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36")
-    
-    driver = webdriver.Chrome(
-        service=Service(ChromeDriverManager().install()),
-        options=options
-    )
-    
+    print(f"Loading {EMBEDDING_MODEL_NAME} on the {backend} backend")
+    return EMBEDDING_BACKENDS[backend](threads=threads)
+
+_model = None
+_model_lock = threading.Lock()
+
+def get_model():
+    """The embedding model, loaded on first use; the lifespan warm-up normally loads it before the first search."""
+    global _model
+    if _model is None:
+        with _model_lock:
+            if _model is None:
+                _model = load_embedding_model()
+    return _model
+
+# Embedding cache and corpus rows are tagged with this, so vectors from different backends never mix.
+EMBEDDING_MODEL_KEY = (
+    EMBEDDING_MODEL_NAME if EMBEDDING_BACKEND == "torch"
+    else f"{EMBEDDING_MODEL_NAME}:{EMBEDDING_BACKEND}:{EMBEDDING_ONNX_FILES.get(EMBEDDING_BACKEND)}"
+)
+
+CACHE_DIR = os.getenv("JOB_FINDER_CACHE_DIR", ".job_finder_cache")
+# Site roots, overridable so the scrapers can run against a local stand-in such as benchmarks/fake_job_site.py.
+LINKEDIN_BASE_URL = os.getenv("LINKEDIN_BASE_URL", "https://www.linkedin.com").rstrip("/")
+GLASSDOOR_BASE_URL = os.getenv("GLASSDOOR_BASE_URL", "https://www.glassdoor.com").rstrip("/")
+
+# ================= Stage Timing =================
+STAGE_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+COUNTER_HELP = {
+    "job_finder_jobs_scraped_total": "Jobs returned by each scraper.",
+    "job_finder_embeddings_total": "Texts embedded, by embedding cache outcome.",
+    "job_finder_relevant_jobs_total": "Jobs returned as relevant by /search_jobs.",
+    "job_finder_postings_total": "Listing cards by whether their details were reused from the posting index or extracted.",
+    "job_finder_corpus_postings_total": "Postings stored in or expired from the job corpus.",
+    "job_finder_sessions_rejected_total": "Searches and browser checkouts turned away because the session wait queue was full.",
+    "job_finder_cards_lost_total": "Listing cards left unextracted because every shard's browser had stopped.",
+    "job_finder_cards_skipped_total": "Listing cards not opened because card triage judged their titles off-target.",
+    "job_finder_duplicates_total": "Scraped jobs merged into a posting found earlier in the same search, by the repeat's source.",
+    "job_finder_browser_kills_total": "Browser process trees ended by the lifecycle manager, by reason (idle, rss, orphan, leaked, shutdown).",
+}
+
+class StageMetrics:
+    """Per-process histograms of stage durations and labelled counters, rendered in the Prometheus text format."""
+
+    def __init__(self, buckets=STAGE_BUCKETS):
+        self.buckets = buckets
+        self._histograms = {}
+        self._counters = {}
+        self._lock = threading.Lock()
+
+    def observe(self, stage, source, seconds, error=False):
+        with self._lock:
+            histogram = self._histograms.setdefault(
+                (stage, source), {"buckets": [0] * len(self.buckets), "count": 0, "sum": 0.0, "errors": 0}
+            )
+            for index, bound in enumerate(self.buckets):
+                if seconds <= bound:
+                    histogram["buckets"][index] += 1
+            histogram["count"] += 1
+            histogram["sum"] += seconds
+            histogram["errors"] += int(error)
+
+    def increment(self, name, amount=1, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + amount
+
+    @staticmethod
+    def _labels(pairs):
+        def escape(value):
+            return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        return "{" + ",".join(f'{name}="{escape(value)}"' for name, value in pairs) + "}"
+
+    def render(self, extra_counters=(), gauges=()):
+        """Prometheus exposition text; extra_counters and gauges add (name, help, [(labels, value)]) from other stats."""
+        with self._lock:
+            histograms = {key: dict(value, buckets=list(value["buckets"])) for key, value in self._histograms.items()}
+            counters = dict(self._counters)
+        lines = [
+            "# HELP job_finder_stage_seconds Time spent in each search stage.",
+            "# TYPE job_finder_stage_seconds histogram",
+        ]
+        for (stage, source), histogram in sorted(histograms.items()):
+            labels = [("stage", stage), ("source", source)]
+            for bound, count in zip(self.buckets, histogram["buckets"]):
+                lines.append(f"job_finder_stage_seconds_bucket{self._labels(labels + [('le', bound)])} {count}")
+            lines.append(f"job_finder_stage_seconds_bucket{self._labels(labels + [('le', '+Inf')])} {histogram['count']}")
+            lines.append(f"job_finder_stage_seconds_sum{self._labels(labels)} {histogram['sum']:.6f}")
+            lines.append(f"job_finder_stage_seconds_count{self._labels(labels)} {histogram['count']}")
+        lines += [
+            "# HELP job_finder_stage_errors_total Stages that ended with an exception.",
+            "# TYPE job_finder_stage_errors_total counter",
+        ]
+        for (stage, source), histogram in sorted(histograms.items()):
+            lines.append(f"job_finder_stage_errors_total{self._labels([('stage', stage), ('source', source)])} {histogram['errors']}")
+        by_name = {}
+        for (name, labels), value in counters.items():
+            by_name.setdefault(name, []).append((list(labels), value))
+        counter_help = {name: COUNTER_HELP.get(name, name) for name in by_name}
+        for name, help_text, samples in extra_counters:
+            by_name.setdefault(name, []).extend(samples)
+            counter_help[name] = help_text
+        for name, samples in sorted(by_name.items()):
+            lines += [f"# HELP {name} {counter_help[name]}", f"# TYPE {name} counter"]
+            for labels, value in sorted(samples):
+                lines.append(f"{name}{self._labels(labels) if labels else ''} {value}")
+        for name, help_text, samples in gauges:
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} gauge"]
+            for labels, value in sorted(samples):
+                lines.append(f"{name}{self._labels(labels) if labels else ''} {value}")
+        return "\n".join(lines) + "\n"
+
+stage_metrics = StageMetrics()
+
+class RequestTiming:
+    """Stage durations collected for one request, summed per source and stage, for the X-Timing header."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self._totals = {}
+        self._lock = threading.Lock()
+
+    def add(self, stage, source, seconds):
+        with self._lock:
+            total = self._totals.setdefault(f"{source}.{stage}", [0.0, 0])
+            total[0] += seconds
+            total[1] += 1
+
+    def header(self):
+        """Server-Timing style entries: name;dur=<ms>;count=<n>, plus the request total."""
+        with self._lock:
+            totals = sorted(self._totals.items())
+        entries = [f"{name};dur={seconds * 1000:.1f};count={count}" for name, (seconds, count) in totals]
+        entries.append(f"total;dur={(time.perf_counter() - self.started) * 1000:.1f}")
+        return ", ".join(entries)
+
+request_timing = contextvars.ContextVar("request_timing", default=None)
+
+@contextlib.contextmanager
+def span(stage, source):
+    """Time a block as `stage` for `source` into the /metrics histograms and the current request's X-Timing."""
+    started = time.perf_counter()
+    error = False
     try:
-        driver.get(f"https://www.linkedin.com/jobs/search/?keywords={criteria.position}&location={criteria.location}")
-        close_linkedin_modal(driver)
-        WebDriverWait(driver, 20).until(
-            EC.presence_of_element_located((By.CSS_SELECTOR, "div.job-search-card"))
-        )
-        wait_until_all_jobs_loaded(driver)
-
-        job_links = driver.find_elements(By.CSS_SELECTOR, "a.base-card__full-link")
-        relevant_jobs = []
-        for job_link in job_links:
-            job_info = extract_linkedin_job_details(driver, job_link, criteria)
-            if job_info:
-                relevant_jobs.append(job_info)
-            time.sleep(1)
-        return relevant_jobs
-    except Exception as e:
-        print(f"LinkedIn Error: {e}")
-        return []
+        yield
+    except Exception:
+        error = True
+        raise
     finally:
-        driver.quit()
-
-# ================= Updated Glassdoor Logic =================
-def close_glassdoor_popups(driver):
-    """Attempt to close any popups or modals that might interfere with clicking."""
-    try:
-        dismiss_btn = driver.find_element(By.XPATH, "//button[contains(text(), 'Dismiss')]")
-        dismiss_btn.click()
-        print("✅ Dismissed popup")
-    except:
-        pass
-    try:
-        close_btn = driver.find_element(By.CSS_SELECTOR, "button[aria-label='Close']")
-        close_btn.click()
-        print("✅ Closed modal")
-    except:
-        pass
-
-def get_location_id(location):
-    """Get Glassdoor location ID using their internal API"""
-    try:
-        formatted_location = location.replace(" ", "+").replace(",", "%2C")
-        response = requests.get(
-            f"https://www.glassdoor.com/findPopularLocationAjax.htm?term={formatted_location}"
-        )
-        data = response.json()
-        return data[0]['locationId'] if data else '1127408'  # Default to Pakistan
-    except Exception as e:
-        print(f"Error getting location ID: {e}")
-        return '1127408'
+        elapsed = time.perf_counter() - started
+        stage_metrics.observe(stage, source, elapsed, error)
+        timing = request_timing.get()
+        if timing is not None:
+            timing.add(stage, source, elapsed)
+
+def in_current_context(fn):
+    """Wrap fn to run in a copy of the caller's context, so worker threads see the caller's timing and budget."""
+    context = contextvars.copy_context()
+    return lambda *args, **kwargs: context.copy().run(fn, *args, **kwargs)
+
+# ================= Search Budget =================
+class SearchBudget:
+    """Relevant-job limit and deadline of one search, checked by the scraping loops, waits and relevance stage."""
+
+    def __init__(self, limit=None, deadline_ms=None):
+        self.limit = limit
+        self.deadline = time.monotonic() + deadline_ms / 1000 if deadline_ms else None
+        self.relevant = 0
+        self.stopped = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def for_criteria(cls, criteria):
+        return cls(criteria.limit, criteria.deadline_ms)
+
+    def time_left(self):
+        return None if self.deadline is None else max(self.deadline - time.monotonic(), 0.0)
+
+    def found_relevant(self, count=1):
+        with self._lock:
+            self.relevant += count
+            if self.limit is not None and self.relevant >= self.limit and self.stopped is None:
+                self.stopped = "limit"
+
+    def stop(self, reason):
+        with self._lock:
+            if self.stopped is None:
+                self.stopped = reason
+
+    def exhausted(self):
+        if self.stopped is None and self.deadline is not None and time.monotonic() >= self.deadline:
+            self.stop("deadline")
+        return self.stopped is not None
+
+search_budget = contextvars.ContextVar("search_budget", default=None)
+
+def search_cut_short():
+    """True once the current search has hit its limit or deadline (or was abandoned)."""
+    budget = search_budget.get()
+    return budget is not None and budget.exhausted()
+
+def search_time_left():
+    budget = search_budget.get()
+    return None if budget is None else budget.time_left()
+
+def with_budget(budget, fn):
+    """Wrap fn to run with `budget` as the current search budget."""
+    context = contextvars.copy_context()
+    context.run(search_budget.set, budget)
+    return lambda *args, **kwargs: context.copy().run(fn, *args, **kwargs)
+
+# ================= Browser Pool =================
+DRIVER_POOL_SIZE = int(os.getenv("DRIVER_POOL_SIZE", "2"))
+DRIVER_MAX_USES = int(os.getenv("DRIVER_MAX_USES", "25"))
+DRIVER_CHECKOUT_TIMEOUT = float(os.getenv("DRIVER_CHECKOUT_TIMEOUT", "300"))
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+BROWSER_HEADLESS = os.getenv("BROWSER_HEADLESS", "1") != "0"
+BROWSER_WINDOW_SIZE = os.getenv("BROWSER_WINDOW_SIZE", "1920,1080")
+
+def extension_patterns(*extensions):
+    """Blocked-URL patterns for files with these extensions, with or without a query string."""
+    return [pattern for extension in extensions for pattern in (f"*.{extension}", f"*.{extension}?*")]
+
+# URL patterns for Network.setBlockedURLs, grouped so each source can pick what it can do without.
+# Only paths that serve nothing but these resources are listed: LinkedIn's hashed static path
+# (static.licdn.com/aero-v1/sc/h/) also serves its CSS and JS bundles, so it is left alone.
+RESOURCE_BLOCK_PATTERNS = {
+    "images": extension_patterns("png", "jpg", "jpeg", "gif", "webp", "avif", "svg", "ico", "bmp")
+        + ["*media.licdn.com/dms/image/*", "*media.glassdoor.com/*"],
+    "media": extension_patterns("mp4", "webm", "m3u8", "mp3", "m4a", "ogg", "wav"),
+    "fonts": extension_patterns("woff", "woff2", "ttf", "otf", "eot"),
+    "trackers": [
+        "*doubleclick.net/*", "*google-analytics.com/*", "*googletagmanager.com/*", "*googlesyndication.com/*",
+        "*googleadservices.com/*", "*adservice.google.com/*", "*facebook.net/*", "*connect.facebook.com/*",
+        "*bat.bing.com/*", "*px.ads.linkedin.com/*", "*snap.licdn.com/*", "*hotjar.com/*",
+        "*scorecardresearch.com/*", "*quantserve.com/*", "*adsrvr.org/*", "*amazon-adsystem.com/*",
+        "*criteo.com/*", "*criteo.net/*", "*taboola.com/*", "*outbrain.com/*", "*demdex.net/*",
+        "*omtrdc.net/*", "*optimizely.com/*", "*segment.io/*", "*newrelic.com/*", "*nr-data.net/*",
+    ],
+}
+SOURCE_BLOCKED_RESOURCES = {
+    source: [
+        category.strip()
+        for category in os.getenv(f"{source.upper()}_BLOCK_RESOURCES", "images,media,fonts,trackers").split(",")
+        if category.strip()
+    ]
+    for source in ("linkedin", "glassdoor")
+}
 
-def construct_glassdoor_url(position, location):
-    """Build URL with dynamic location ID"""
-    position_slug = position.replace(" ", "-")
-    location_slug = location.replace(" ", "-").replace(",", "-")
-    location_id = get_location_id(location)
-    
-    return f"https://www.glassdoor.com/Job/{location_slug}-{position_slug}-jobs-SRCH_IL.0,{len(location_slug)}_IC{location_id}_KO{len(location_slug)+1},{len(location_slug)+1+len(position_slug)}.htm"
+@functools.lru_cache(maxsize=None)
+def chromedriver_path():
+    """Resolve chromedriver once per process instead of once per scrape."""
+    from webdriver_manager.chrome import ChromeDriverManager
+    return ChromeDriverManager().install()
 
-def scrape_glassdoor_jobs(criteria):
+def build_chrome_options():
     options = Options()
-    options.add_experimental_option("detach", True)
     options.add_argument("--disable-notifications")
     options.add_argument("--disable-popup-blocking")
-    options.add_argument("--start-maximized")
-    options.add_argument("user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36")
-
-    driver = webdriver.Chrome(
-        service=Service(ChromeDriverManager().install()),
-        options=options
-    )
+    if BROWSER_HEADLESS:
+        options.add_argument("--headless=new")
+        options.add_argument("--disable-gpu")
+        options.add_argument("--disable-dev-shm-usage")
+        options.add_argument(f"--window-size={BROWSER_WINDOW_SIZE}")
+    else:
+        options.add_argument("--start-maximized")
+    options.add_argument(f"user-agent={USER_AGENT}")
+    # Chrome ignores the flag, but it marks the process as ours for orphan reaping.
+    options.add_argument(f"{BROWSER_OWNER_FLAG}={os.getpid()}")
+    return options
+
+def blocked_url_patterns(source):
+    """URL patterns the browser should refuse to fetch while scraping `source` (none for unknown sources)."""
+    patterns = []
+    for category in SOURCE_BLOCKED_RESOURCES.get(source, ()):
+        if category not in RESOURCE_BLOCK_PATTERNS:
+            print(f"Unknown resource category for {source}: {category}")
+            continue
+        patterns.extend(RESOURCE_BLOCK_PATTERNS[category])
+    return patterns
 
-    job_data = []
+def apply_resource_blocking(driver, source):
+    driver.execute_cdp_cmd("Network.enable", {})
+    driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": blocked_url_patterns(source)})
 
-    try:
-        url = construct_glassdoor_url(criteria.position, criteria.location)
-        driver.get(url)
-        print(f"✅ Opened Glassdoor URL: {url}")
+def launch_driver():
+    return webdriver.Chrome(
+        service=Service(chromedriver_path()),
+        options=build_chrome_options()
+    )
 
+# ================= Session Scheduling =================
+# 0 means a source may use every session in the pool.
+SOURCE_MAX_SESSIONS = {
+    source: int(os.getenv(f"{source.upper()}_MAX_SESSIONS", "0")) for source in ("linkedin", "glassdoor")
+}
+SESSION_QUEUE_LIMIT = int(os.getenv("SESSION_QUEUE_LIMIT", "8"))
+SESSION_HOLD_HISTORY = 50
+SESSION_STOP_POLL = 0.5
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BACKGROUND = 1
+session_priority = contextvars.ContextVar("session_priority", default=PRIORITY_INTERACTIVE)
+
+def with_priority(priority, fn):
+    """Wrap fn so the browser checkouts it makes queue at `priority`."""
+    context = contextvars.copy_context()
+    context.run(session_priority.set, priority)
+    return lambda *args, **kwargs: context.copy().run(fn, *args, **kwargs)
+
+class SessionsBusy(Exception):
+    """Raised instead of queueing once SESSION_QUEUE_LIMIT browser checkouts are already waiting."""
+
+    def __init__(self, retry_after):
+        super().__init__(f"All browser sessions are busy, retry in {retry_after} s")
+        self.retry_after = retry_after
+
+class SessionScheduler:
+    """Process-wide budget of browser sessions with per-source limits and a bounded priority wait queue.
+
+    A checkout is granted at once when a session is free and its source is under its limit. Otherwise it waits,
+    interactive searches before background ones and then in arrival order, and a waiter whose source is at its
+    limit does not hold up the waiters behind it. When queue_limit checkouts are already waiting, new ones are
+    turned away with SessionsBusy and a Retry-After estimate instead of over-committing.
+    """
+
+    def __init__(self, size, source_limits=SOURCE_MAX_SESSIONS, queue_limit=SESSION_QUEUE_LIMIT):
+        self.size = size
+        self.source_limits = source_limits
+        self.queue_limit = queue_limit
+        self._in_use = collections.Counter()
+        self._waiting = []
+        self._order = itertools.count()
+        self._holds = collections.deque(maxlen=SESSION_HOLD_HISTORY)
+        self._rejected = collections.Counter()
+        self._condition = threading.Condition()
+
+    def _can_grant(self, source):
+        limit = self.source_limits.get(source) or self.size
+        return sum(self._in_use.values()) < self.size and self._in_use[source] < limit
+
+    def _retry_after(self):
+        """Seconds until a rejected search is likely to get a session: the queue ahead times the typical hold."""
+        hold = sorted(self._holds)[len(self._holds) // 2] if self._holds else 30.0
+        return max(1, math.ceil(hold * (len(self._waiting) + 1) / max(self.size, 1)))
+
+    def _reject(self, source):
+        self._rejected[source] += 1
+        stage_metrics.increment("job_finder_sessions_rejected_total", source=source)
+        raise SessionsBusy(self._retry_after())
+
+    def admit(self, source="search"):
+        """Turn a new search away before it starts when the wait queue is already full."""
+        with self._condition:
+            if len(self._waiting) >= self.queue_limit:
+                self._reject(source)
+
+    def acquire(self, source, timeout):
+        started = time.monotonic()
+        with self._condition:
+            if self._can_grant(source):
+                self._in_use[source] += 1
+            else:
+                if len(self._waiting) >= self.queue_limit:
+                    self._reject(source)
+                waiter = {"source": source, "granted": False}
+                # The arrival counter is unique, so entries sort without ever comparing the waiter dicts.
+                entry = (session_priority.get(), next(self._order), waiter)
+                bisect.insort(self._waiting, entry)
+                while not waiter["granted"]:
+                    remaining = started + timeout - time.monotonic()
+                    if remaining <= 0 or search_cut_short():
+                        self._waiting.remove(entry)
+                        raise TimeoutError("No browser session available")
+                    # Wakes up now and then so a search stopped while queued gives up its place.
+                    self._condition.wait(min(remaining, SESSION_STOP_POLL))
+        stage_metrics.observe("session_wait", source, time.monotonic() - started)
+
+    def release(self, source, held=None):
+        with self._condition:
+            self._in_use[source] -= 1
+            if held is not None:
+                self._holds.append(held)
+            for entry in list(self._waiting):
+                waiter = entry[2]
+                if self._can_grant(waiter["source"]):
+                    self._waiting.remove(entry)
+                    waiter["granted"] = True
+                    self._in_use[waiter["source"]] += 1
+            self._condition.notify_all()
+
+    def snapshot(self):
+        with self._condition:
+            waiting = collections.Counter(entry[2]["source"] for entry in self._waiting)
+            return {
+                "size": self.size,
+                "queue_limit": self.queue_limit,
+                "source_limits": {source: limit or self.size for source, limit in self.source_limits.items()},
+                "in_use": {source: count for source, count in self._in_use.items() if count},
+                "waiting": dict(waiting),
+                "waiting_background": sum(1 for entry in self._waiting if entry[0] == PRIORITY_BACKGROUND),
+                "rejected": dict(self._rejected),
+                "retry_after": self._retry_after(),
+            }
+
+# ================= Browser Processes =================
+BROWSER_RSS_LIMIT_MB = float(os.getenv("BROWSER_RSS_LIMIT_MB", "1500"))
+BROWSER_IDLE_TIMEOUT = float(os.getenv("BROWSER_IDLE_TIMEOUT", "900"))
+BROWSER_REAP_INTERVAL = float(os.getenv("BROWSER_REAP_INTERVAL", "60"))
+BROWSER_REAP_GRACE = 60  # a Chrome this young may still be starting up and not yet tracked
+BROWSER_OWNER_FLAG = "--job-finder-owner"
+
+class BrowserProcesses:
+    """The chromedriver process tree of every session this worker launched: its RSS, and killing it.
+
+    Chrome is started with --job-finder-owner=<worker pid>. A tagged tree whose worker is gone (crashed or killed)
+    or that this worker no longer tracks (a failed launch, a quit that did not finish) is an orphan and gets reaped.
+    Needs psutil; without it sessions end only through driver.quit() and RSS limits and reaping are off.
+    """
+
+    def __init__(self, rss_limit_mb=BROWSER_RSS_LIMIT_MB):
+        self.rss_limit = rss_limit_mb * 1024 * 1024
+        self._sessions = {}
+        self._lock = threading.Lock()
+        self.kills = collections.Counter()
+
+    def track(self, driver):
+        process = getattr(getattr(driver, "service", None), "process", None)
+        if process is not None:
+            with self._lock:
+                self._sessions[id(driver)] = process.pid
+
+    def untrack(self, driver):
+        """Forget a quit driver, killing whatever part of its tree quit() left running."""
+        with self._lock:
+            pid = self._sessions.pop(id(driver), None)
+        if pid is not None and self._kill_tree(pid):
+            self.record_kill("leaked")
+
+    def _tree(self, pid):
+        try:
+            root = psutil.Process(pid)
+            return [root] + root.children(recursive=True)
+        except psutil.Error:
+            return []
+
+    def _kill_tree(self, pid):
+        if psutil is None:
+            return 0
+        processes = self._tree(pid)
+        for process in processes:
+            try:
+                process.kill()
+            except psutil.Error:
+                pass
+        psutil.wait_procs(processes, timeout=5)
+        return len(processes)
+
+    def record_kill(self, reason):
+        self.kills[reason] += 1
+        stage_metrics.increment("job_finder_browser_kills_total", reason=reason)
+
+    def rss(self, key):
+        """Resident memory of a session's chromedriver and Chrome processes, in bytes."""
+        with self._lock:
+            pid = self._sessions.get(key)
+        if psutil is None or pid is None:
+            return 0
+        total = 0
+        for process in self._tree(pid):
+            try:
+                total += process.memory_info().rss
+            except psutil.Error:
+                pass
+        return total
+
+    def over_limit(self, key):
+        return self.rss_limit > 0 and self.rss(key) > self.rss_limit
+
+    def kill(self, key, reason):
+        with self._lock:
+            pid = self._sessions.get(key)
+        if pid is not None and self._kill_tree(pid):
+            self.record_kill(reason)
+
+    def kill_all(self, reason="shutdown"):
+        with self._lock:
+            keys = list(self._sessions)
+        for key in keys:
+            self.kill(key, reason)
+
+    def reap_orphans(self):
+        """Kill tagged Chrome trees whose worker is gone or that this worker does not track; returns how many."""
+        if psutil is None:
+            return 0
+        with self._lock:
+            pids = list(self._sessions.values())
+        tracked = {process.pid for pid in pids for process in self._tree(pid)}
+        reaped = 0
+        for process in psutil.process_iter(["cmdline", "create_time"]):
+            owner = next(
+                (arg.split("=", 1)[1] for arg in process.info["cmdline"] or () if arg.startswith(f"{BROWSER_OWNER_FLAG}=")),
+                None
+            )
+            if owner is None or not owner.isdigit() or process.pid in tracked:
+                continue
+            started = process.info["create_time"] or 0
+            if int(owner) == os.getpid():
+                if time.time() - started < BROWSER_REAP_GRACE:
+                    continue
+                reason = "leaked"
+            else:
+                try:
+                    # A live owner started before this Chrome did; otherwise the owner PID was reused.
+                    if psutil.Process(int(owner)).create_time() <= started:
+                        continue
+                except psutil.Error:
+                    pass
+                reason = "orphan"
+            root = process
+            try:
+                parent = process.parent()
+                if parent is not None and "chromedriver" in parent.name().lower():
+                    root = parent
+            except psutil.Error:
+                pass
+            if self._kill_tree(root.pid):
+                reaped += 1
+                self.record_kill(reason)
+        return reaped
+
+    def snapshot(self):
+        with self._lock:
+            keys = list(self._sessions)
+        sizes = [self.rss(key) for key in keys]
+        return {
+            "process_tracking": psutil is not None,
+            "sessions": len(keys),
+            "rss_bytes": sum(sizes),
+            "max_session_rss_bytes": max(sizes, default=0),
+            "rss_limit_bytes": int(self.rss_limit),
+            "kills": dict(self.kills),
+        }
+
+browser_processes = BrowserProcesses()
+
+@app.exception_handler(SessionsBusy)
+def sessions_busy(request, exc):
+    return JSONResponse({"detail": str(exc)}, status_code=429, headers={"Retry-After": str(exc.retry_after)})
+
+class DriverPool:
+    """Pre-launched Chrome drivers shared by the scrapers, reset between uses and recycled after max_uses."""
+
+    def __init__(self, size=DRIVER_POOL_SIZE, max_uses=DRIVER_MAX_USES):
+        self.size = size
+        self.max_uses = max_uses
+        self._idle = queue.LifoQueue()
+        self.scheduler = SessionScheduler(size)
+        self._checkouts = {}
+        self._idle_since = {}
+        self._uses = {}
+        self._blocking = {}
+        self._live = 0
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def _launch(self, source=None):
+        try:
+            with span("driver_launch", source or "pool"):
+                driver = launch_driver()
+        except Exception:
+            with self._lock:
+                self._live -= 1
+            raise
+        browser_processes.track(driver)
+        with self._lock:
+            self._uses[id(driver)] = 0
+        return driver
+
+    def _park(self, driver):
+        self._idle_since[id(driver)] = time.monotonic()
+        self._idle.put(driver)
+
+    def _take_idle(self, timeout=None):
+        driver = self._idle.get(timeout=timeout) if timeout is not None else self._idle.get_nowait()
+        self._idle_since.pop(id(driver), None)
+        return driver
+
+    def _discard(self, driver):
+        with self._lock:
+            self._uses.pop(id(driver), None)
+            self._blocking.pop(id(driver), None)
+            self._live -= 1
         try:
-            WebDriverWait(driver, 10).until(
-                EC.element_to_be_clickable((By.CSS_SELECTOR, "button#onetrust-accept-btn-handler"))
-            ).click()
-            print("✅ Accepted cookies")
+            driver.quit()
         except Exception:
             pass
+        browser_processes.untrack(driver)
 
-        job_list_container = WebDriverWait(driver, 30).until(
-            EC.presence_of_element_located((By.CSS_SELECTOR, "ul.jobsList, ul[aria-label='Jobs List']"))
-        )
-        print("✅ Job listings container loaded")
-
-        last_job_count = 0
-        current_job_count = len(driver.find_elements(By.CSS_SELECTOR, "li.react-job-listing, li[data-test='jobListing']"))
-
-        while current_job_count > last_job_count:
-            last_job_count = current_job_count
-            driver.execute_script("arguments[0].scrollTo(0, arguments[0].scrollHeight)", job_list_container)
-            time.sleep(2)
+    def is_healthy(self, driver):
+        """Whether the browser still answers; a driver that does not is discarded when it is released."""
+        try:
+            driver.current_url
+            return len(driver.window_handles) > 0
+        except Exception:
+            return False
 
+    def _reset(self, driver):
+        """Close extra tabs and clear cookies and storage so the next search starts clean."""
+        try:
+            handles = driver.window_handles
+            for handle in handles[1:]:
+                driver.switch_to.window(handle)
+                driver.close()
+            driver.switch_to.window(handles[0])
             try:
-                show_more_jobs_btn = driver.find_element(By.CSS_SELECTOR, "button.jobsearch-LoadMoreJobs, button[data-test='load-more-jobs']")
-                if show_more_jobs_btn.is_displayed():
-                    show_more_jobs_btn.click()
-                    print("✅ Clicked 'Show More' button")
-                    time.sleep(3)
+                driver.execute_script("window.localStorage.clear(); window.sessionStorage.clear();")
+                origin = driver.execute_script("return window.location.origin;")
+                if origin and origin.startswith("http"):
+                    driver.execute_cdp_cmd("Storage.clearDataForOrigin", {"origin": origin, "storageTypes": "all"})
             except Exception:
                 pass
-
-            current_job_count = len(driver.find_elements(By.CSS_SELECTOR, "li.react-job-listing, li[data-test='jobListing']"))
-
-        print(f"✅ Loaded total {current_job_count} job cards")
-
-        job_listings = driver.find_elements(By.CSS_SELECTOR, "li.react-job-listing, li[data-test='jobListing']")
-
-        for index, job_card in enumerate(job_listings):
-            print(f"\n📄 Processing job {index+1}/{len(job_listings)}")
+            driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+            driver.get("about:blank")
+            return True
+        except Exception:
+            return False
+
+    def warm(self):
+        """Launch drivers up to the pool size so the first searches skip Chrome cold start; returns launch errors."""
+        with self._lock:
+            missing = max(self.size - self._live, 0)
+            self._live += missing
+        errors = []
+        for _ in range(missing):
             try:
-                driver.execute_script("arguments[0].scrollIntoView({behavior: 'smooth', block: 'center'});", job_card)
-                time.sleep(1)
-                try:
-                    job_title_link = job_card.find_element(By.CSS_SELECTOR, "a[data-test='job-title'], a.jobTitle, a.jobCard_jobTitle")
-                    job_title_link.click()
-                except:
-                    job_card.click()
-
-                WebDriverWait(driver, 10).until(
-                    EC.presence_of_element_located((By.CSS_SELECTOR, "div.TwoColumnLayout_columnRight__GRvqO, div.TwoColumnLayout_jobDetailsContainer__qyvJZ"))
-                )
-                time.sleep(2)
-
-                close_glassdoor_popups(driver)
-
-                try:
-                    show_more_btn = WebDriverWait(driver, 5).until(
-                        EC.element_to_be_clickable((By.CSS_SELECTOR, "button[data-test='show-more-cta'][aria-expanded='false']"))
-                    )
-                    driver.execute_script("arguments[0].scrollIntoView({behavior: 'smooth', block: 'center'});", show_more_btn)
-                    time.sleep(1)
-                    try:
-                        ActionChains(driver).move_to_element(show_more_btn).click().perform()
-                    except ElementClickInterceptedException:
-                        driver.execute_script("arguments[0].click();", show_more_btn)
-                    WebDriverWait(driver, 5).until(
-                        EC.presence_of_element_located((By.CSS_SELECTOR, "button[data-test='show-more-cta'][aria-expanded='true']"))
-                    )
-                    time.sleep(2)
-                except:
-                    pass
-
-                # Extract job info
-                try:
-                    job_title = driver.find_element(By.CSS_SELECTOR, "h1[id^='jd-job-title']").text.strip()
-                except:
-                    job_title = criteria.position
-
-
-                try:
-                    company = driver.find_element(By.CSS_SELECTOR, "h4[class*='heading_Subhead']").text.strip()
-                except:
-                    company = "N/A"
-
-
-                try:
-                    location = driver.find_element(By.CSS_SELECTOR, "div[data-test='location'], div.companyLocation").text.strip()
-                except:
-                    location = criteria.location
-
-                try:
-                    salary = driver.find_element(By.CSS_SELECTOR, "div[data-test='detailSalary'], div.salaryEstimate").text.strip()
-                except:
-                    salary = criteria.salary
-
-                try:
-                    description = driver.find_element(By.CSS_SELECTOR, "div.JobDetails_jobDescription__uW_fK > div").text.strip()
-                except:
-                    description = ""
-
-                apply_link = driver.current_url
-
-                job_info = {
-                    "job_title": job_title,
-                    "company": company,
-                    "experience": criteria.experience,
-                    "jobNature": criteria.jobNature,
-                    "location": location,
-                    "salary": salary,
-                    "description": description,
-                    "apply_link": apply_link
-                }
-
-                print(f"✅ Collected: {job_title} at {company}")
-                job_data.append(job_info)
-
+                self._park(self._launch())
             except Exception as e:
-                print(f"❌ Error processing job {index+1}: {e}")
-                continue
-
-        return job_data
-
-    except Exception as e:
-        print(f"❌ Glassdoor scraping failed: {e}")
-        return []
-
-
-@app.post("/search_jobs")
-def search_jobs(criteria: JobSearchCriteria):
-    with ThreadPoolExecutor() as executor:
-        future_linkedin = executor.submit(scrape_linkedin_jobs, criteria)
-        future_glassdoor = executor.submit(scrape_glassdoor_jobs, criteria)
-
-        linkedin_results = future_linkedin.result()
-        glassdoor_results = future_glassdoor.result()
-
-    # Optionally tag each job with the source
-    for job in linkedin_results:
-        job['source'] = "LinkedIn"
-    for job in glassdoor_results:
-        job['source'] = "Glassdoor"
-
-    merged_results = linkedin_results + glassdoor_results
-    return {"total_results": len(merged_results), "jobs": merged_results}
-    # return {"total_results": len(linkedin_results), "jobs": linkedin_results}
-
-
-if __name__ == "__main__":
-    import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
-
-
-#############################################
-from fastapi import FastAPI
-from pydantic import BaseModel
-from sentence_transformers import SentenceTransformer
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, ElementClickInterceptedException
-from selenium.webdriver.common.action_chains import ActionChains
-from selenium.webdriver.common.keys import Keys
-from webdriver_manager.chrome import ChromeDriverManager
-from bs4 import BeautifulSoup
-from urllib.parse import urlencode
-from concurrent.futures import ThreadPoolExecutor
-from selenium.webdriver.chrome.options import Options
-import requests
-import time
-from scipy.spatial.distance import cosine
+                print(f"Driver warm-up failed: {e}")
+                errors.append(str(e))
+        return errors
+
+    def acquire(self, timeout=DRIVER_CHECKOUT_TIMEOUT, source=None):
+        source = source or "pool"
+        deadline = time.monotonic() + timeout
+        self.scheduler.acquire(source, timeout)
+        try:
+            while True:
+                with self._lock:
+                    launch = self._idle.empty() and self._live < self.size
+                    if launch:
+                        self._live += 1
+                if launch:
+                    driver = self._launch(source)
+                    break
+                try:
+                    driver = self._take_idle(timeout=0.5)
+                except queue.Empty:
+                    if time.monotonic() > deadline:
+                        raise TimeoutError("No browser session available")
+                    continue
+                if self.is_healthy(driver):
+                    break
+                self._discard(driver)
+        except BaseException:
+            self.scheduler.release(source)
+            raise
+        with self._lock:
+            self._checkouts[id(driver)] = (source, time.monotonic())
+        return driver
+
+    def release(self, driver):
+        try:
+            with self._lock:
+                uses = self._uses.get(id(driver), 0) + 1
+                self._uses[id(driver)] = uses
+            if self._closed or uses >= self.max_uses or not self._reset(driver):
+                self._discard(driver)
+            else:
+                self._park(driver)
+        finally:
+            with self._lock:
+                source, checked_out_at = self._checkouts.pop(id(driver))
+            self.scheduler.release(source, time.monotonic() - checked_out_at)
+
+    def _configure(self, driver, source):
+        """Switch the driver's request blocking to `source`'s rules, skipping the CDP calls if already set."""
+        if self._blocking.get(id(driver), object()) == source:
+            return
+        try:
+            apply_resource_blocking(driver, source)
+            self._blocking[id(driver)] = source
+        except Exception as e:
+            self._blocking.pop(id(driver), None)
+            print(f"Resource blocking not applied for {source}: {e}")
+
+    @contextlib.contextmanager
+    def session(self, source=None):
+        timeout = DRIVER_CHECKOUT_TIMEOUT
+        time_left = search_time_left()
+        if time_left is not None:
+            timeout = min(timeout, time_left)
+        driver = self.acquire(timeout, source=source)
+        try:
+            self._configure(driver, source)
+            yield driver
+        finally:
+            self.release(driver)
+
+    def enforce_limits(self):
+        """Quit idle drivers past BROWSER_IDLE_TIMEOUT and kill any session whose processes are over the RSS limit."""
+        now = time.monotonic()
+        kept = []
+        while True:
+            try:
+                driver = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            idle_since = self._idle_since.pop(id(driver), now)
+            if BROWSER_IDLE_TIMEOUT > 0 and now - idle_since > BROWSER_IDLE_TIMEOUT:
+                browser_processes.record_kill("idle")
+                self._discard(driver)
+            elif browser_processes.over_limit(id(driver)):
+                browser_processes.kill(id(driver), "rss")
+                self._discard(driver)
+            else:
+                kept.append((driver, idle_since))
+        for driver, idle_since in reversed(kept):
+            self._idle_since[id(driver)] = idle_since
+            self._idle.put(driver)
+        # A checked-out browser over the limit is killed outright: its scraper sees a dead session and
+        # release() discards it.
+        with self._lock:
+            busy = list(self._checkouts)
+        for key in busy:
+            if browser_processes.over_limit(key):
+                browser_processes.kill(key, "rss")
+
+    def shutdown(self):
+        self._closed = True
+        while True:
+            try:
+                self._discard(self._take_idle())
+            except queue.Empty:
+                break
 
-app = FastAPI()
+driver_pool = DriverPool()
 
-class JobSearchCriteria(BaseModel):
-    position: str
-    experience: str
-    salary: str
-    jobNature: str
-    location: str
-    skills: str
+browser_maintenance_stop = threading.Event()
 
-# Initialize LLM model
-model = SentenceTransformer('all-MiniLM-L6-v2')
+def maintain_browsers():
+    """Every BROWSER_REAP_INTERVAL seconds, enforce the pool's idle and RSS limits and reap orphaned browsers."""
+    while not browser_maintenance_stop.wait(BROWSER_REAP_INTERVAL):
+        try:
+            driver_pool.enforce_limits()
+            browser_processes.reap_orphans()
+        except Exception as e:
+            print(f"Browser maintenance failed: {e}")
+
+# ================= Startup =================
+class StartupState:
+    """Warm-up steps started by the lifespan, each pending, ready or failed, with how long it took."""
+
+    def __init__(self):
+        self.started_at = None
+        self._components = {}
+        self._lock = threading.Lock()
+
+    def start(self, warmups):
+        self.started_at = time.monotonic()
+        with self._lock:
+            self._components = {name: {"status": "pending"} for name in warmups}
+        for name, warm in warmups.items():
+            threading.Thread(target=self._run, args=(name, warm), daemon=True, name=f"warm-{name}").start()
+
+    def _run(self, name, warm):
+        started = time.monotonic()
+        try:
+            warm()
+            status = {"status": "ready"}
+        except Exception as e:
+            print(f"Warm-up of {name} failed: {e}")
+            status = {"status": "failed", "error": str(e)}
+        status["seconds"] = round(time.monotonic() - started, 3)
+        with self._lock:
+            self._components[name] = status
+
+    def snapshot(self):
+        with self._lock:
+            components = {name: dict(status) for name, status in self._components.items()}
+        return {
+            "ready": bool(components) and all(status["status"] == "ready" for status in components.values()),
+            "uptime_seconds": round(time.monotonic() - self.started_at, 3) if self.started_at is not None else None,
+            "components": components,
+        }
+
+startup_state = StartupState()
+
+def warm_embedding_model():
+    """Load the model and run one encode so the first search does not pay for lazy initialisation."""
+    get_model().encode(["warm-up"], batch_size=1, normalize_embeddings=True, convert_to_numpy=True)
+
+def warm_browser_pool():
+    reaped = browser_processes.reap_orphans()
+    if reaped:
+        print(f"Reaped {reaped} orphaned browser(s) left by earlier workers")
+    errors = driver_pool.warm()
+    if errors:
+        raise RuntimeError(f"{len(errors)} of {driver_pool.size} browsers failed to launch: {errors[0]}")
+
+@app.get("/ready")
+def ready():
+    """200 once the lifespan warm-up has loaded the model and filled the browser pool, 503 until then."""
+    state = startup_state.snapshot()
+    return JSONResponse(state, status_code=200 if state["ready"] else 503)
+
+# ================= Adaptive Waits =================
+WAIT_HISTORY = 50
+WAIT_HEADROOM = float(os.getenv("WAIT_HEADROOM", "3"))
+WAIT_MIN_TIMEOUT = float(os.getenv("WAIT_MIN_TIMEOUT", "1.5"))
+WAIT_POLL_SECONDS = 0.1
+
+class WaitEngine:
+    """Event-driven waits whose timeouts adapt to the latencies recently observed per source and step.
+
+    Each wait polls its condition and returns as soon as it holds. The timeout for a step is HEADROOM times
+    the p95 of its recent successful waits, kept between WAIT_MIN_TIMEOUT and the caller's max_timeout.
+    Timeouts on required steps push the timeout back up; optional steps (elements that are often simply
+    absent) only count them.
+    """
+
+    def __init__(self, history=WAIT_HISTORY, headroom=WAIT_HEADROOM, min_timeout=WAIT_MIN_TIMEOUT):
+        self.history = history
+        self.headroom = headroom
+        self.min_timeout = min_timeout
+        self._samples = {}
+        self._stats = {}
+        self._lock = threading.Lock()
+
+    def _learned_timeout(self, source, step):
+        with self._lock:
+            samples = sorted(self._samples.get((source, step), ()))
+        if len(samples) < 5:
+            return None
+        p95 = samples[int(0.95 * (len(samples) - 1))]
+        return max(self.min_timeout, p95 * self.headroom)
+
+    def timeout(self, source, step, max_timeout):
+        learned = self._learned_timeout(source, step)
+        return max_timeout if learned is None else min(max_timeout, learned)
+
+    def until(self, driver, source, step, condition, max_timeout, optional=False):
+        """Wait for condition like WebDriverWait.until, raising TimeoutException, and record the time spent."""
+        timeout = self.timeout(source, step, max_timeout)
+        # A search budget can cut the wait short; such timeouts say nothing about the page, so they are not learned.
+        time_left = search_time_left()
+        clamped = time_left is not None and time_left < timeout
+        if clamped:
+            timeout = time_left
+        started = time.monotonic()
+        try:
+            result = WebDriverWait(driver, timeout, poll_frequency=WAIT_POLL_SECONDS).until(condition)
+        except TimeoutException:
+            sample = None if optional or clamped else max_timeout
+            self._record(source, step, time.monotonic() - started, timed_out=True, sample=sample)
+            raise
+        elapsed = time.monotonic() - started
+        self._record(source, step, elapsed, timed_out=False, sample=elapsed)
+        return result
+
+    def _record(self, source, step, elapsed, timed_out, sample):
+        with self._lock:
+            stats = self._stats.setdefault((source, step), {"count": 0, "timeouts": 0, "total_seconds": 0.0})
+            stats["count"] += 1
+            stats["timeouts"] += int(timed_out)
+            stats["total_seconds"] += elapsed
+            if sample is not None:
+                self._samples.setdefault((source, step), collections.deque(maxlen=self.history)).append(sample)
+
+    def snapshot(self):
+        with self._lock:
+            stats = {key: dict(value) for key, value in self._stats.items()}
+        snapshot = {}
+        for (source, step), values in stats.items():
+            learned = self._learned_timeout(source, step)
+            snapshot[f"{source}.{step}"] = {
+                "count": values["count"],
+                "timeouts": values["timeouts"],
+                "total_seconds": round(values["total_seconds"], 3),
+                "mean_seconds": round(values["total_seconds"] / values["count"], 3),
+                "learned_timeout": None if learned is None else round(learned, 3),
+            }
+        return snapshot
+
+wait_engine = WaitEngine()
+
+def cards_loaded_beyond(card_selector, count):
+    return lambda driver: len(driver.find_elements(By.CSS_SELECTOR, card_selector)) > count
+
+class network_idle:
+    """Condition: the document has loaded and no new resource requests started for `quiet` seconds."""
+
+    def __init__(self, quiet=0.5):
+        self.quiet = quiet
+        self._count = None
+        self._since = None
+
+    def __call__(self, driver):
+        state, count = driver.execute_script(
+            "return [document.readyState, performance.getEntriesByType('resource').length];"
+        )
+        now = time.monotonic()
+        if state != "complete" or count != self._count:
+            self._count = count
+            self._since = now
+            return False
+        return now - self._since >= self.quiet
 
 def close_linkedin_modal(driver):
     selectors = [
@@ -406,36 +1047,40 @@ def close_linkedin_modal(driver):
     ]
     for selector in selectors:
         try:
-            btn = WebDriverWait(driver, 10).until(
-                EC.element_to_be_clickable((By.CSS_SELECTOR, selector))
+            btn = wait_engine.until(
+                driver, "linkedin", "modal", EC.element_to_be_clickable((By.CSS_SELECTOR, selector)), 10, optional=True
             )
             btn.click()
-            time.sleep(1)
+            try:
+                wait_engine.until(driver, "linkedin", "modal_close", EC.invisibility_of_element(btn), 3, optional=True)
+            except TimeoutException:
+                pass
             return True
         except TimeoutException:
             continue
     try:
         ActionChains(driver).send_keys(Keys.ESCAPE).perform()
-        time.sleep(1)
         return True
     except Exception:
         return False
 
-def wait_until_all_jobs_loaded(driver, card_selector="div.job-search-card", max_wait=60):
+def wait_until_all_jobs_loaded(driver, card_selector="div.job-search-card", max_wait=60, stop_when=None):
     start_time = time.time()
     prev_count = -1
-    while True:
+    while not search_cut_short():
         cards = driver.find_elements(By.CSS_SELECTOR, card_selector)
         curr_count = len(cards)
         driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
         try:
-            WebDriverWait(driver, 10).until(
-                lambda d: len(d.find_elements(By.CSS_SELECTOR, card_selector)) > curr_count
+            wait_engine.until(
+                driver, "linkedin", "listing_scroll", cards_loaded_beyond(card_selector, curr_count), 10, optional=True
             )
         except TimeoutException:
             pass
         if curr_count == prev_count or (time.time() - start_time) > max_wait:
             break
+        if stop_when is not None and stop_when(driver):
+            break
         prev_count = curr_count
 
 def extract_linkedin_job_details(driver, job_link_element, criteria):
@@ -445,87 +1090,382 @@ def extract_linkedin_job_details(driver, job_link_element, criteria):
         job_link_element.click()
     except ElementClickInterceptedException:
         driver.execute_script("window.scrollBy(0, 100);")
-        time.sleep(1)
+        wait_engine.until(driver, "linkedin", "card_clickable", EC.element_to_be_clickable(job_link_element), 5)
         job_link_element.click()
 
+    return read_linkedin_job_details(driver, job_link_element.get_attribute('href'), criteria)
+
+def extract_linkedin_job_page(driver, job_url, criteria):
+    """Open a job's view page directly instead of clicking its card; used by the sharded extractor."""
+    driver.get(job_url)
+    return read_linkedin_job_details(driver, job_url, criteria)
+
+def read_linkedin_job_details(driver, apply_link, criteria):
     try:
-        WebDriverWait(driver, 15).until(
-            EC.presence_of_element_located((By.CSS_SELECTOR, "h2.top-card-layout__title"))
+        wait_engine.until(
+            driver, "linkedin", "detail_title",
+            EC.presence_of_element_located((By.CSS_SELECTOR, "h2.top-card-layout__title")), 15
         )
     except TimeoutException:
         return None
 
     try:
-        show_more_btn = WebDriverWait(driver, 10).until(
+        show_more_btn = wait_engine.until(
+            driver, "linkedin", "show_more",
             EC.element_to_be_clickable(
-                (By.CSS_SELECTOR, "button.show-more-less-html__button.show-more-less-button[aria-expanded='false']"))
+                (By.CSS_SELECTOR, "button.show-more-less-html__button.show-more-less-button[aria-expanded='false']")),
+            10, optional=True
         )
         driver.execute_script("arguments[0].scrollIntoView();", show_more_btn)
         show_more_btn.click()
-        WebDriverWait(driver, 20).until(
+        wait_engine.until(
+            driver, "linkedin", "show_more_expanded",
             EC.presence_of_element_located(
-                (By.CSS_SELECTOR, "button.show-more-less-html__button.show-more-less-button[aria-expanded='true']"))
+                (By.CSS_SELECTOR, "button.show-more-less-html__button.show-more-less-button[aria-expanded='true']")),
+            20
         )
     except TimeoutException:
         pass
 
-    soup = BeautifulSoup(driver.page_source, "html.parser")
+    # Only the top card and description cross the WebDriver wire, not the whole serialized page.
+    return parse_linkedin_job_html(driver.execute_script(LINKEDIN_FRAGMENT_JS), apply_link, criteria)
+
+# ================= LinkedIn Detail Parsing =================
+LINKEDIN_PARSER = os.getenv("LINKEDIN_PARSER", "lxml" if lxml is not None else "html.parser")
+
+LINKEDIN_FRAGMENT_JS = """
+const title = document.querySelector("h2.top-card-layout__title");
+const topCard = title ? (title.closest(".top-card-layout") || title.closest("section") || title.parentElement) : null;
+const description = document.querySelector("div.description__text.description__text--rich");
+return (topCard ? topCard.outerHTML : "") + (description ? description.outerHTML : "");
+"""
+
+class ParseStats:
+    """Running totals of LinkedIn detail parsing: cards, HTML bytes parsed and parse time."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.cards = 0
+        self.bytes = 0
+        self.seconds = 0.0
+
+    def record(self, size, seconds):
+        with self._lock:
+            self.cards += 1
+            self.bytes += size
+            self.seconds += seconds
+
+    def snapshot(self):
+        with self._lock:
+            cards = self.cards or 1
+            return {
+                "parser": LINKEDIN_PARSER,
+                "cards": self.cards,
+                "bytes": self.bytes,
+                "seconds": round(self.seconds, 4),
+                "mean_bytes_per_card": round(self.bytes / cards),
+                "mean_ms_per_card": round(1000 * self.seconds / cards, 3),
+            }
+
+parse_stats = ParseStats()
+
+def _lxml_strings(element):
+    if element.tag not in ("script", "style", "template") and element.text:
+        yield element.text
+    for child in element:
+        if isinstance(child.tag, str):
+            yield from _lxml_strings(child)
+        if child.tail:
+            yield child.tail
+
+def _lxml_text(element, separator=""):
+    """Same output as BeautifulSoup's get_text(separator, strip=True)."""
+    return separator.join(s.strip() for s in _lxml_strings(element) if s.strip())
+
+def _has_class(tag, class_name):
+    return f"//{tag}[contains(concat(' ', normalize-space(@class), ' '), ' {class_name} ')]"
+
+def _has_exact_class(tag, classes):
+    return f"//{tag}[normalize-space(@class)='{classes}']"
+
+def _linkedin_fields_lxml(html):
+    if not html.strip():
+        return None, "", None, ""
+    root = lxml.html.fromstring(html)
+
+    def first(xpath):
+        found = root.xpath(xpath)
+        return found[0] if found else None
+
+    title_tag = first(_has_class("h2", "top-card-layout__title"))
+    company_tag = first(_has_class("span", "topcard__flavor"))
+    if company_tag is None:
+        company_tag = first(_has_exact_class("a", "topcard__org-name-link topcard__flavor--black-link"))
+    location_tag = first(_has_exact_class("span", "topcard__flavor topcard__flavor--bullet"))
+    description_tag = first(_has_exact_class("div", "description__text description__text--rich"))
+    return (
+        _lxml_text(title_tag) if title_tag is not None else None,
+        _lxml_text(company_tag) if company_tag is not None else "",
+        _lxml_text(location_tag) if location_tag is not None else None,
+        _lxml_text(description_tag, "\n") if description_tag is not None else "",
+    )
+
+def _linkedin_fields_soup(html):
+    soup = BeautifulSoup(html, "html.parser")
     title_tag = soup.find("h2", class_="top-card-layout__title")
-    job_title = title_tag.get_text(strip=True) if title_tag else criteria.position
     company_tag = soup.find("span", class_="topcard__flavor")
     if not company_tag:
         company_tag = soup.find("a", class_="topcard__org-name-link topcard__flavor--black-link")
-    company_name = company_tag.get_text(strip=True) if company_tag else ""
     location_tag = soup.find("span", class_="topcard__flavor topcard__flavor--bullet")
-    location = location_tag.get_text(strip=True) if location_tag else criteria.location
-    apply_link = job_link_element.get_attribute('href')
     description_tag = soup.find("div", class_="description__text description__text--rich")
-    job_description = description_tag.get_text(separator="\n", strip=True) if description_tag else ""
+    return (
+        title_tag.get_text(strip=True) if title_tag else None,
+        company_tag.get_text(strip=True) if company_tag else "",
+        location_tag.get_text(strip=True) if location_tag else None,
+        description_tag.get_text(separator="\n", strip=True) if description_tag else "",
+    )
+
+def parse_linkedin_job_html(html, apply_link, criteria, parser=None):
+    started = time.perf_counter()
+    if (parser or LINKEDIN_PARSER) == "lxml":
+        job_title, company_name, location, job_description = _linkedin_fields_lxml(html)
+    else:
+        job_title, company_name, location, job_description = _linkedin_fields_soup(html)
+    parse_stats.record(len(html.encode("utf-8")), time.perf_counter() - started)
 
     return {
-        "job_title": job_title,
+        "job_title": job_title if job_title is not None else criteria.position,
         "company": company_name,
         "experience": criteria.experience,
         "description": job_description,
         "jobNature": criteria.jobNature,
-        "location": location,
+        "location": location if location is not None else criteria.location,
         "salary": criteria.salary,
         "apply_link": apply_link,
+        "from_criteria": ["experience", "jobNature", "salary"]
+            + (["job_title"] if job_title is None else []) + (["location"] if location is None else []),
     }
 
-def scrape_linkedin_jobs(criteria):
-    options = Options()
-    options.add_argument("--disable-notifications")
-    options.add_argument("--disable-popup-blocking")
-    options.add_argument("--start-maximized")
-    options.add_argument("user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36")
-    
-    driver = webdriver.Chrome(
-        service=Service(ChromeDriverManager().install()),
-        options=options
-    )
-    
+# ================= LinkedIn HTTP Detail Fetching =================
+LINKEDIN_DETAIL_MODE = os.getenv("LINKEDIN_DETAIL_MODE", "browser")
+LINKEDIN_HTTP_CONCURRENCY = int(os.getenv("LINKEDIN_HTTP_CONCURRENCY", "8"))
+HTTP_TIMEOUT = (3.05, float(os.getenv("HTTP_READ_TIMEOUT", "15")))
+
+def build_http_session(pool_size, retries=2):
+    """Keep-alive session with a connection pool sized for concurrent fetches and retries on throttling."""
+    session = requests.Session()
+    session.headers.update({"User-Agent": USER_AGENT, "Accept-Language": "en-US,en;q=0.9"})
+    retry = Retry(total=retries, backoff_factor=0.5, status_forcelist=(429, 500, 502, 503, 504), allowed_methods=("GET",))
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size, max_retries=retry)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+http_session = build_http_session(LINKEDIN_HTTP_CONCURRENCY)
+
+def fetch_linkedin_job_page(url, criteria):
+    if search_cut_short():
+        return None
+    with span("card_extraction", "linkedin"):
+        try:
+            response = http_session.get(url, timeout=HTTP_TIMEOUT)
+            response.raise_for_status()
+        except requests.RequestException as e:
+            print(f"LinkedIn detail fetch failed for {url}: {e}")
+            return None
+        # Sign-in walls come back as 200 without a job top card.
+        if "top-card-layout__title" not in response.text:
+            return None
+        return parse_linkedin_job_html(response.text, url, criteria)
+
+def fetch_linkedin_job_details(job_urls, criteria):
+    """Fetch public job view pages concurrently and yield parsed details (or None) in listing order."""
+    executor = ThreadPoolExecutor(max_workers=LINKEDIN_HTTP_CONCURRENCY, thread_name_prefix="linkedin-http")
     try:
-        driver.get(f"https://www.linkedin.com/jobs/search/?keywords={criteria.position}&location={criteria.location}")
-        close_linkedin_modal(driver)
-        WebDriverWait(driver, 20).until(
-            EC.presence_of_element_located((By.CSS_SELECTOR, "div.job-search-card"))
-        )
-        wait_until_all_jobs_loaded(driver)
+        yield from executor.map(in_current_context(lambda url: fetch_linkedin_job_page(url, criteria)), job_urls)
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+# ================= Sharded Detail Extraction =================
+LINKEDIN_SHARDS = int(os.getenv("LINKEDIN_SHARDS", "1"))
+GLASSDOOR_SHARDS = int(os.getenv("GLASSDOOR_SHARDS", "1"))
+SHARD_MAX_ATTEMPTS = 2
+
+def extract_sharded(source, items, shards, extract):
+    """Run extract(driver, item) on up to `shards` pooled browsers in parallel, yielding results in input order.
+
+    Shards pull cards from one shared queue, so a slow card only holds up its own shard. A shard whose
+    browser dies hands its current card back and checks out a fresh browser, so the card is retried even
+    when no other shard is left; cards still left over when every shard has stopped are logged, counted and
+    yielded as None.
+    """
+    work = queue.Queue()
+    for index, item in enumerate(items):
+        work.put((index, item, 1))
+    results = queue.Queue()
+    stop = threading.Event()
+
+    def run_session():
+        """Extract cards on one browser; True when the browser died and the shard should check out another."""
+        with driver_pool.session(source) as driver:
+            while not stop.is_set() and not search_cut_short():
+                try:
+                    index, item, attempt = work.get_nowait()
+                except queue.Empty:
+                    return False
+                try:
+                    with span("card_extraction", source):
+                        results.put((index, extract(driver, item)))
+                except Exception as e:
+                    print(f"Shard failed on card {index + 1}: {e}")
+                    if driver_pool.is_healthy(driver):
+                        results.put((index, None))
+                    elif attempt < SHARD_MAX_ATTEMPTS:
+                        work.put((index, item, attempt + 1))
+                        return True
+                    else:
+                        results.put((index, None))
+                        return True
+        return False
+
+    def shard():
+        try:
+            # The dead browser is discarded on release, so the next session is a fresh one. Every restart
+            # follows a failed attempt at a card, and those are capped, so this ends.
+            while run_session():
+                pass
+        except Exception as e:
+            print(f"Shard could not start: {e}")
+        finally:
+            results.put((None, None))
+
+    workers = [threading.Thread(target=in_current_context(shard), daemon=True) for _ in range(min(shards, len(items)))]
+    for worker in workers:
+        worker.start()
+
+    buffered = {}
+    next_index = 0
+    live = len(workers)
+    try:
+        while next_index < len(items) and (live or not results.empty()):
+            index, result = results.get()
+            if index is None:
+                live -= 1
+                continue
+            buffered[index] = result
+            while next_index in buffered:
+                yield buffered.pop(next_index)
+                next_index += 1
+        lost = sum(1 for index in range(next_index, len(items)) if index not in buffered)
+        if lost and not search_cut_short():
+            print(f"{source}: {lost} card(s) left unextracted after every shard stopped")
+            stage_metrics.increment("job_finder_cards_lost_total", lost, source=source)
+        for index in range(next_index, len(items)):
+            yield buffered.pop(index, None)
+    finally:
+        stop.set()
+
+class SearchProgress:
+    """Per-source card counters that the scrapers update while a search runs."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._sources = {}
+
+    def _counters(self, source):
+        return self._sources.setdefault(source, {"discovered": 0, "skipped": 0, "processed": 0})
+
+    def discovered(self, source, count):
+        with self._lock:
+            self._counters(source)["discovered"] = count
+
+    def skipped(self, source, count):
+        with self._lock:
+            self._counters(source)["skipped"] = count
+
+    def processed(self, source):
+        with self._lock:
+            self._counters(source)["processed"] += 1
+
+    def snapshot(self):
+        with self._lock:
+            return {source: dict(counters) for source, counters in self._sources.items()}
+
+def iter_linkedin_jobs(criteria, progress=None):
+    progress = progress or SearchProgress()
+    if LISTING_MODE == "paged":
+        cards = discover_paged("linkedin", lambda page: linkedin_page_url(criteria, page))
+        if cards:
+            progress.discovered("linkedin", len(cards))
+            yield from iter_linkedin_card_details(cards, criteria, progress)
+            return
+        print("LinkedIn paged listing returned no cards; falling back to scrolling")
+
+    with driver_pool.session("linkedin") as driver:
+        with span("page_load", "linkedin"):
+            driver.get(f"{LINKEDIN_BASE_URL}/jobs/search/?keywords={criteria.position}&location={criteria.location}")
+        with span("dismiss_overlays", "linkedin"):
+            close_linkedin_modal(driver)
+        with span("page_load", "linkedin"):
+            wait_engine.until(
+                driver, "linkedin", "listing", EC.presence_of_element_located((By.CSS_SELECTOR, "div.job-search-card")), 20
+            )
+        with span("scroll_to_load", "linkedin"):
+            wait_until_all_jobs_loaded(driver, stop_when=known_run_reached("linkedin"))
 
         job_links = driver.find_elements(By.CSS_SELECTOR, "a.base-card__full-link")
-        relevant_jobs = []
-        for job_link in job_links:
-            job_info = extract_linkedin_job_details(driver, job_link, criteria)
-            if job_info:
-                relevant_jobs.append(job_info)
-            time.sleep(1)
-        return relevant_jobs
+        cards = read_listing_cards(driver, "linkedin")
+        known = posting_index.known("linkedin", cards, criteria)
+        progress.discovered("linkedin", len(job_links))
+        if LINKEDIN_DETAIL_MODE != "http" and LINKEDIN_SHARDS <= 1:
+            keep = triage_cards("linkedin", cards, criteria, progress)
+            for job_link, card, kept in zip(job_links, cards, keep):
+                if search_cut_short():
+                    return
+                if not kept:
+                    continue
+                job_info = known.get(card["job_id"])
+                if job_info is None:
+                    with span("card_extraction", "linkedin"):
+                        job_info = with_card_id(card, extract_linkedin_job_details(driver, job_link, criteria))
+                    posting_index.store("linkedin", card, job_info)
+                progress.processed("linkedin")
+                if job_info:
+                    yield job_info
+            return
+
+    # The browser goes back to the pool once the listing is discovered.
+    yield from iter_linkedin_card_details(cards, criteria, progress, known)
+
+def iter_linkedin_card_details(cards, criteria, progress, known=None):
+    """Details for discovered listing cards, opened as job pages (over HTTP or on sharded browsers)."""
+    cards = [card for card, kept in zip(cards, triage_cards("linkedin", cards, criteria, progress)) if kept]
+    if known is None:
+        known = posting_index.known("linkedin", cards, criteria)
+    job_urls = [card["url"] for card in cards if card["job_id"] not in known]
+    if LINKEDIN_DETAIL_MODE == "http":
+        details = fetch_linkedin_job_details(job_urls, criteria)
+    else:
+        details = extract_sharded(
+            "linkedin", job_urls, max(LINKEDIN_SHARDS, 1),
+            lambda driver, job_url: extract_linkedin_job_page(driver, job_url, criteria)
+        )
+    for job_info in merge_known_postings("linkedin", cards, known, details):
+        progress.processed("linkedin")
+        if job_info:
+            yield job_info
+
+def scrape_linkedin_jobs(criteria, progress=None):
+    try:
+        with span("scrape", "linkedin"):
+            jobs = list(iter_linkedin_jobs(criteria, progress))
+    except SessionsBusy:
+        raise
     except Exception as e:
         print(f"LinkedIn Error: {e}")
         return []
-    finally:
-        driver.quit()
+    stage_metrics.increment("job_finder_jobs_scraped_total", len(jobs), source="linkedin")
+    return jobs
 
 def close_glassdoor_popups(driver):
     try:
@@ -539,196 +1479,1851 @@ def close_glassdoor_popups(driver):
     except:
         pass
 
+# ================= Glassdoor Location Resolution =================
+DEFAULT_GLASSDOOR_LOCATION_ID = '1127408'  # Pakistan
+GLASSDOOR_LOCATION_CACHE_PATH = os.getenv("GLASSDOOR_LOCATION_CACHE_PATH", os.path.join(CACHE_DIR, "glassdoor_locations.json"))
+GLASSDOOR_LOCATION_SEED = os.getenv("GLASSDOOR_LOCATION_SEED")
+GLASSDOOR_LOCATION_NEGATIVE_TTL = float(os.getenv("GLASSDOOR_LOCATION_NEGATIVE_TTL", "3600"))
+GLASSDOOR_LOCATION_TIMEOUT = (2, 3)
+# Without retries, so a dead endpoint costs one GLASSDOOR_LOCATION_TIMEOUT before the default location is used.
+location_http_session = build_http_session(2, retries=0)
+
+class LocationResolver:
+    """Glassdoor location IDs cached in memory and in a JSON file; failed lookups are cached for negative_ttl."""
+
+    def __init__(self, path, seed_path=None, negative_ttl=GLASSDOOR_LOCATION_NEGATIVE_TTL):
+        self.path = path
+        self.negative_ttl = negative_ttl
+        self._ids = {}
+        self._misses = {}
+        self._lock = threading.Lock()
+        self.lookups = 0
+        self._ids.update(self._read(path).get("ids", {}))
+        if seed_path:
+            self.preload(seed_path)
+
+    @staticmethod
+    def normalize(location):
+        return " ".join(location.lower().split())
+
+    @staticmethod
+    def _read(path):
+        try:
+            with open(path, encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            print(f"Could not read location cache {path}: {e}")
+            return {}
+
+    def _save(self):
+        # Merge with what other workers wrote since we loaded, then replace the file atomically.
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            with self._lock:
+                ids = {**self._read(self.path).get("ids", {}), **self._ids}
+                self._ids.update(ids)
+            tmp_path = f"{self.path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"ids": ids}, f, indent=1, sort_keys=True)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f"Could not write location cache {self.path}: {e}")
+
+    def preload(self, seed_path):
+        """Load a {location: locationId} JSON seed file so those locations never hit the network."""
+        seed = self._read(seed_path)
+        with self._lock:
+            self._ids.update({self.normalize(location): str(location_id) for location, location_id in seed.items()})
+
+    def _lookup(self, location):
+        self.lookups += 1
+        try:
+            response = location_http_session.get(
+                f"{GLASSDOOR_BASE_URL}/findPopularLocationAjax.htm",
+                params={"term": location},
+                timeout=GLASSDOOR_LOCATION_TIMEOUT
+            )
+            response.raise_for_status()
+            data = response.json()
+            return str(data[0]['locationId']) if data else None
+        except (requests.RequestException, ValueError, KeyError, IndexError, TypeError) as e:
+            # An unexpected response shape is a failed lookup too, cached as a miss like a network error.
+            print(f"Error getting location ID: {e}")
+            return None
+
+    def resolve(self, location):
+        with span("location_lookup", "glassdoor"):
+            return self._resolve(location)
+
+    def _resolve(self, location):
+        key = self.normalize(location)
+        with self._lock:
+            if key in self._ids:
+                return self._ids[key]
+            missed_at = self._misses.get(key)
+            if missed_at is not None and time.time() - missed_at < self.negative_ttl:
+                return DEFAULT_GLASSDOOR_LOCATION_ID
+
+        location_id = self._lookup(location)
+        if location_id is None:
+            with self._lock:
+                self._misses[key] = time.time()
+            return DEFAULT_GLASSDOOR_LOCATION_ID
+        with self._lock:
+            self._ids[key] = location_id
+            self._misses.pop(key, None)
+        self._save()
+        return location_id
+
+location_resolver = LocationResolver(GLASSDOOR_LOCATION_CACHE_PATH, GLASSDOOR_LOCATION_SEED)
+
 def get_location_id(location):
-    try:
-        formatted_location = location.replace(" ", "+").replace(",", "%2C")
-        response = requests.get(
-            f"https://www.glassdoor.com/findPopularLocationAjax.htm?term={formatted_location}"
-        )
-        data = response.json()
-        return data[0]['locationId'] if data else '1127408'
-    except Exception as e:
-        print(f"Error getting location ID: {e}")
-        return '1127408'
+    return location_resolver.resolve(location)
 
 def construct_glassdoor_url(position, location):
     position_slug = position.replace(" ", "-")
     location_slug = location.replace(" ", "-").replace(",", "-")
     location_id = get_location_id(location)
     
-    return f"https://www.glassdoor.com/Job/{location_slug}-{position_slug}-jobs-SRCH_IL.0,{len(location_slug)}_IC{location_id}_KO{len(location_slug)+1},{len(location_slug)+1+len(position_slug)}.htm"
+    return f"{GLASSDOOR_BASE_URL}/Job/{location_slug}-{position_slug}-jobs-SRCH_IL.0,{len(location_slug)}_IC{location_id}_KO{len(location_slug)+1},{len(location_slug)+1+len(position_slug)}.htm"
+
+# Selectors per detail field, tried in order; the first match wins.
+GLASSDOOR_DETAIL_SELECTORS = {
+    "job_title": ["h1[id^='jd-job-title']"],
+    "company": ["h4[class*='heading_Subhead']"],
+    "location": ["div[data-test='location']", "div.companyLocation"],
+    "salary": ["div[data-test='detailSalary']", "div.salaryEstimate"],
+    "description": ["div.JobDetails_jobDescription__uW_fK > div"],
+}
+
+# Reads every field in one WebDriver round trip; missing fields come back as null.
+GLASSDOOR_EXTRACT_JS = """
+const fields = {};
+for (const [name, selectors] of Object.entries(arguments[0])) {
+    fields[name] = null;
+    for (const selector of selectors) {
+        const element = document.querySelector(selector);
+        if (element) {
+            fields[name] = element.innerText.trim();
+            break;
+        }
+    }
+}
+fields.apply_link = window.location.href;
+return fields;
+"""
 
-def scrape_glassdoor_jobs(criteria):
-    options = Options()
-    options.add_experimental_option("detach", True)
-    options.add_argument("--disable-notifications")
-    options.add_argument("--disable-popup-blocking")
-    options.add_argument("--start-maximized")
-    options.add_argument("user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36")
+def read_glassdoor_job_details(driver, criteria):
+    """Read the job shown in the details pane (or on a standalone job page)."""
+    close_glassdoor_popups(driver)
 
-    driver = webdriver.Chrome(
-        service=Service(ChromeDriverManager().install()),
-        options=options
-    )
+    try:
+        show_more_btn = wait_engine.until(
+            driver, "glassdoor", "show_more",
+            EC.element_to_be_clickable((By.CSS_SELECTOR, "button[data-test='show-more-cta'][aria-expanded='false']")),
+            5, optional=True
+        )
+        driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", show_more_btn)
+        try:
+            ActionChains(driver).move_to_element(show_more_btn).click().perform()
+        except ElementClickInterceptedException:
+            driver.execute_script("arguments[0].click();", show_more_btn)
+        wait_engine.until(
+            driver, "glassdoor", "show_more_expanded",
+            EC.presence_of_element_located((By.CSS_SELECTOR, "button[data-test='show-more-cta'][aria-expanded='true']")),
+            5
+        )
+    except:
+        pass
+
+    fields = driver.execute_script(GLASSDOOR_EXTRACT_JS, GLASSDOOR_DETAIL_SELECTORS)
+
+    def field(name, default):
+        value = fields.get(name)
+        return default if value is None else value
 
-    job_data = []
+    job_info = {
+        "job_title": field("job_title", criteria.position),
+        "company": field("company", "N/A"),
+        "experience": criteria.experience,
+        "jobNature": criteria.jobNature,
+        "location": field("location", criteria.location),
+        "salary": field("salary", criteria.salary),
+        "description": field("description", ""),
+        "apply_link": fields["apply_link"],
+        "from_criteria": ["experience", "jobNature"]
+            + [name for name in ("job_title", "location", "salary") if fields.get(name) is None],
+    }
+    return job_info
 
+def extract_glassdoor_job_page(driver, job_url, criteria):
+    """Open a job's own page instead of clicking its card; used by the sharded extractor."""
+    if not job_url:
+        return None
+    driver.get(job_url)
     try:
-        url = construct_glassdoor_url(criteria.position, criteria.location)
-        driver.get(url)
+        wait_engine.until(
+            driver, "glassdoor", "job_page",
+            EC.presence_of_element_located((By.CSS_SELECTOR, "h1[id^='jd-job-title']")), 15
+        )
+    except TimeoutException:
+        return None
+    return read_glassdoor_job_details(driver, criteria)
+
+def glassdoor_card_job_id(job_card):
+    try:
+        return job_card.get_attribute('data-jobid') or job_card.get_attribute('data-id') or None
+    except Exception:
+        return None
+
+def wait_for_glassdoor_pane(driver, job_card):
+    """Wait until the details pane shows the clicked card: its job title if the card has an ID, else network idle."""
+    wait_engine.until(
+        driver, "glassdoor", "detail_pane",
+        EC.presence_of_element_located((By.CSS_SELECTOR, "div.TwoColumnLayout_columnRight__GRvqO, div.TwoColumnLayout_jobDetailsContainer__qyvJZ")),
+        10
+    )
+    job_id = glassdoor_card_job_id(job_card)
+    try:
+        if job_id:
+            wait_engine.until(
+                driver, "glassdoor", "detail_title",
+                EC.presence_of_element_located((By.CSS_SELECTOR, f"h1[id='jd-job-title-{job_id}']")), 5
+            )
+        else:
+            wait_engine.until(driver, "glassdoor", "detail_idle", network_idle(), 5)
+    except TimeoutException:
+        pass
+
+GLASSDOOR_CARD_SELECTOR = "li.react-job-listing, li[data-test='jobListing']"
+
+def load_all_glassdoor_jobs(driver, job_list_container, card_selector=GLASSDOOR_CARD_SELECTOR, stop_when=None):
+    """Scroll the job list and press "show more jobs" until no new cards appear (or stop_when(driver) holds)."""
+    last_job_count = 0
+    current_job_count = len(driver.find_elements(By.CSS_SELECTOR, card_selector))
+
+    while current_job_count > last_job_count and not search_cut_short():
+        if stop_when is not None and stop_when(driver):
+            break
+        last_job_count = current_job_count
+        driver.execute_script("arguments[0].scrollTo(0, arguments[0].scrollHeight)", job_list_container)
+        try:
+            wait_engine.until(
+                driver, "glassdoor", "listing_scroll", cards_loaded_beyond(card_selector, last_job_count), 2, optional=True
+            )
+        except TimeoutException:
+            pass
 
         try:
-            WebDriverWait(driver, 10).until(
-                EC.element_to_be_clickable((By.CSS_SELECTOR, "button#onetrust-accept-btn-handler"))
-            ).click()
+            show_more_jobs_btn = driver.find_element(By.CSS_SELECTOR, "button.jobsearch-LoadMoreJobs, button[data-test='load-more-jobs']")
+            if show_more_jobs_btn.is_displayed():
+                loaded_count = len(driver.find_elements(By.CSS_SELECTOR, card_selector))
+                show_more_jobs_btn.click()
+                wait_engine.until(
+                    driver, "glassdoor", "listing_show_more", cards_loaded_beyond(card_selector, loaded_count), 10, optional=True
+                )
         except Exception:
             pass
 
-        job_list_container = WebDriverWait(driver, 30).until(
-            EC.presence_of_element_located((By.CSS_SELECTOR, "ul.jobsList, ul[aria-label='Jobs List']"))
-        )
+        current_job_count = len(driver.find_elements(By.CSS_SELECTOR, card_selector))
 
-        last_job_count = 0
-        current_job_count = len(driver.find_elements(By.CSS_SELECTOR, "li.react-job-listing, li[data-test='jobListing']"))
+def iter_glassdoor_jobs(criteria, progress=None):
+    progress = progress or SearchProgress()
+    if LISTING_MODE == "paged":
+        first_page = construct_glassdoor_url(criteria.position, criteria.location)
+        cards = discover_paged("glassdoor", lambda page: glassdoor_page_url(first_page, page))
+        if cards:
+            progress.discovered("glassdoor", len(cards))
+            yield from iter_glassdoor_card_details(cards, criteria, progress)
+            return
+        print("Glassdoor paged listing returned no cards; falling back to scrolling")
 
-        while current_job_count > last_job_count:
-            last_job_count = current_job_count
-            driver.execute_script("arguments[0].scrollTo(0, arguments[0].scrollHeight)", job_list_container)
-            time.sleep(2)
+    with driver_pool.session("glassdoor") as driver:
+        url = construct_glassdoor_url(criteria.position, criteria.location)
+        with span("page_load", "glassdoor"):
+            driver.get(url)
 
+        with span("dismiss_overlays", "glassdoor"):
             try:
-                show_more_jobs_btn = driver.find_element(By.CSS_SELECTOR, "button.jobsearch-LoadMoreJobs, button[data-test='load-more-jobs']")
-                if show_more_jobs_btn.is_displayed():
-                    show_more_jobs_btn.click()
-                    time.sleep(3)
+                wait_engine.until(
+                    driver, "glassdoor", "cookies",
+                    EC.element_to_be_clickable((By.CSS_SELECTOR, "button#onetrust-accept-btn-handler")), 10, optional=True
+                ).click()
             except Exception:
                 pass
 
-            current_job_count = len(driver.find_elements(By.CSS_SELECTOR, "li.react-job-listing, li[data-test='jobListing']"))
-
-        job_listings = driver.find_elements(By.CSS_SELECTOR, "li.react-job-listing, li[data-test='jobListing']")
+        with span("page_load", "glassdoor"):
+            job_list_container = wait_engine.until(
+                driver, "glassdoor", "listing",
+                EC.presence_of_element_located((By.CSS_SELECTOR, "ul.jobsList, ul[aria-label='Jobs List']")), 30
+            )
 
-        for job_card in job_listings:
-            try:
-                driver.execute_script("arguments[0].scrollIntoView({behavior: 'smooth', block: 'center'});", job_card)
-                time.sleep(1)
+        with span("scroll_to_load", "glassdoor"):
+            load_all_glassdoor_jobs(driver, job_list_container, stop_when=known_run_reached("glassdoor"))
+
+        job_listings = driver.find_elements(By.CSS_SELECTOR, GLASSDOOR_CARD_SELECTOR)
+        cards = read_listing_cards(driver, "glassdoor")
+        known = posting_index.known("glassdoor", cards, criteria)
+        progress.discovered("glassdoor", len(job_listings))
+        if GLASSDOOR_SHARDS <= 1:
+            keep = triage_cards("glassdoor", cards, criteria, progress)
+            for job_card, card, kept in zip(job_listings, cards, keep):
+                if search_cut_short():
+                    return
+                if not kept:
+                    continue
+                job_info = known.get(card["job_id"])
+                if job_info is not None:
+                    progress.processed("glassdoor")
+                    yield job_info
+                    continue
                 try:
-                    job_title_link = job_card.find_element(By.CSS_SELECTOR, "a[data-test='job-title'], a.jobTitle, a.jobCard_jobTitle")
-                    job_title_link.click()
-                except:
-                    job_card.click()
+                    with span("card_extraction", "glassdoor"):
+                        driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", job_card)
+                        try:
+                            job_title_link = job_card.find_element(By.CSS_SELECTOR, "a[data-test='job-title'], a.jobTitle, a.jobCard_jobTitle")
+                            job_title_link.click()
+                        except:
+                            job_card.click()
+
+                        wait_for_glassdoor_pane(driver, job_card)
+
+                        job_info = with_card_id(card, read_glassdoor_job_details(driver, criteria))
+                except Exception:
+                    continue
+                finally:
+                    progress.processed("glassdoor")
+                posting_index.store("glassdoor", card, job_info)
+                yield job_info
+            return
+
+    # The listing browser goes back to the pool; each shard opens job pages directly.
+    yield from iter_glassdoor_card_details(cards, criteria, progress, known)
+
+def iter_glassdoor_card_details(cards, criteria, progress, known=None):
+    """Details for discovered listing cards, each opened as its own job page on sharded browsers."""
+    cards = [card for card, kept in zip(cards, triage_cards("glassdoor", cards, criteria, progress)) if kept]
+    if known is None:
+        known = posting_index.known("glassdoor", cards, criteria)
+    job_urls = [card["url"] for card in cards if card["job_id"] not in known]
+    details = extract_sharded(
+        "glassdoor", job_urls, max(GLASSDOOR_SHARDS, 1),
+        lambda driver, job_url: extract_glassdoor_job_page(driver, job_url, criteria)
+    )
+    for job_info in merge_known_postings("glassdoor", cards, known, details):
+        progress.processed("glassdoor")
+        if job_info:
+            yield job_info
+
+def scrape_glassdoor_jobs(criteria, progress=None):
+    try:
+        with span("scrape", "glassdoor"):
+            jobs = list(iter_glassdoor_jobs(criteria, progress))
+    except SessionsBusy:
+        raise
+    except Exception as e:
+        print(f"Glassdoor scraping failed: {e}")
+        return []
+    stage_metrics.increment("job_finder_jobs_scraped_total", len(jobs), source="glassdoor")
+    return jobs
+
+# ================= Seen Postings =================
+INCREMENTAL_SCRAPING = os.getenv("INCREMENTAL_SCRAPING", "1") != "0"
+POSTING_INDEX_PATH = os.getenv("POSTING_INDEX_PATH", os.path.join(CACHE_DIR, "postings.sqlite3"))
+POSTING_MAX_AGE = float(os.getenv("POSTING_MAX_AGE", "86400"))
+POSTING_RETENTION = float(os.getenv("POSTING_RETENTION", str(30 * 86400)))
+INCREMENTAL_STOP_AFTER_KNOWN = int(os.getenv("INCREMENTAL_STOP_AFTER_KNOWN", "0"))
+
+# Job fields the scrapers take from the search criteria, mapped to the criteria attribute.
+CRITERIA_FIELDS = {
+    "job_title": "position",
+    "experience": "experience",
+    "jobNature": "jobNature",
+    "salary": "salary",
+    "location": "location",
+}
+
+# Per source: the element each listing entry is read from, its card, its job link and the card text that
+# makes up the fingerprint (fields that change with the posting, not with the day it is viewed), starting
+# with the title, company and location.
+LISTING_CARDS = {
+    "linkedin": {
+        "item": "a.base-card__full-link",
+        "card": "div.job-search-card",
+        "link": "a.base-card__full-link",
+        "text": ["h3.base-search-card__title", "h4.base-search-card__subtitle", "span.job-search-card__location"],
+    },
+    "glassdoor": {
+        "item": GLASSDOOR_CARD_SELECTOR,
+        "card": GLASSDOOR_CARD_SELECTOR,
+        "link": "a[data-test='job-title'], a.jobTitle, a.jobCard_jobTitle",
+        "text": [
+            "a[data-test='job-title'], a.jobTitle, a.jobCard_jobTitle",
+            "span[class*='EmployerProfile_compactEmployerName'], div.employerName",
+            "div[data-test='emp-location']",
+            "div[class*='salaryEstimate']",
+        ],
+    },
+}
+
+LISTING_CARDS_JS = """
+const [itemSelector, cardSelector, linkSelector, textSelectors] = arguments;
+return Array.from(document.querySelectorAll(itemSelector)).map(item => {
+    const card = item.closest(cardSelector) || item;
+    const link = item.matches(linkSelector) ? item : card.querySelector(linkSelector);
+    return {
+        url: link ? link.href : null,
+        card_id: card.getAttribute("data-jobid") || card.getAttribute("data-id")
+            || (card.getAttribute("data-entity-urn") || "").split(":").pop() || null,
+        texts: textSelectors.map(selector => {
+            const element = card.querySelector(selector);
+            return element ? element.innerText : "";
+        }),
+    };
+});
+"""
+
+def posting_job_id(source, url, card_id=None):
+    """Stable posting ID: the number ending a LinkedIn /jobs/view/ path or Glassdoor's jl listing ID, else the card's own ID."""
+    if url:
+        if source == "linkedin":
+            match = re.search(r"/jobs/view/(?:[^/?#]*-)?(\d+)", url)
+        else:
+            match = re.search(r"[?&]jl=(\d+)", url)
+        if match:
+            return match.group(1)
+    return card_id or None
+
+def listing_card(source, url, card_id, texts):
+    """A listing entry: its URL, stable job ID, title, company, location and a fingerprint of its card text."""
+    texts = [" ".join(text.split()) for text in texts]
+    return {
+        "url": url,
+        "job_id": posting_job_id(source, url, card_id),
+        "fingerprint": hashlib.sha1("\n".join(texts).encode("utf-8")).hexdigest(),
+        "title": texts[0],
+        "company": texts[1],
+        "location": texts[2],
+    }
 
-                WebDriverWait(driver, 10).until(
-                    EC.presence_of_element_located((By.CSS_SELECTOR, "div.TwoColumnLayout_columnRight__GRvqO, div.TwoColumnLayout_jobDetailsContainer__qyvJZ"))
+def with_card_id(card, job):
+    """job tagged with its listing card's posting ID, which identifies it when the apply link carries none."""
+    if job and card.get("job_id"):
+        job["job_id"] = card["job_id"]
+    return job
+
+def read_listing_cards(driver, source):
+    """Every listing entry on the page, in page order, from one script call."""
+    selectors = LISTING_CARDS[source]
+    cards = driver.execute_script(
+        LISTING_CARDS_JS, selectors["item"], selectors["card"], selectors["link"], selectors["text"]
+    ) or []
+    return [listing_card(source, card["url"], card["card_id"], card["texts"]) for card in cards]
+
+def parse_listing_cards(html, source, base_url):
+    """Listing entries from a paged listing response, the HTML counterpart of read_listing_cards."""
+    selectors = LISTING_CARDS[source]
+    soup = BeautifulSoup(html, "lxml" if lxml is not None else "html.parser")
+    cards = []
+    for card in soup.select(selectors["card"]):
+        link = card.select_one(selectors["link"])
+        url = urljoin(base_url, link["href"]) if link is not None and link.get("href") else None
+        card_id = card.get("data-jobid") or card.get("data-id") or (card.get("data-entity-urn") or "").split(":")[-1]
+        texts = []
+        for selector in selectors["text"]:
+            element = card.select_one(selector)
+            texts.append(element.get_text(" ") if element is not None else "")
+        cards.append(listing_card(source, url, card_id or None, texts))
+    return cards
+
+def fill_from_criteria(job, criteria):
+    job = dict(job)
+    for field in job.get("from_criteria", ()):
+        job[field] = getattr(criteria, CRITERIA_FIELDS[field])
+    return job
+
+class PostingIndex:
+    """Details of postings already extracted, keyed by source and job ID, in a SQLite file shared by all workers.
+
+    A card is known when its ID is stored, its card-text fingerprint is unchanged and its details are younger
+    than max_age; known cards reuse the stored details, with the criteria-derived fields filled in afresh.
+    """
+
+    SQL_CHUNK = 500  # job IDs per IN clause, under SQLite's bound-parameter limit
+    TRIM_EVERY = 500  # stores between deletions of postings past retention
+
+    def __init__(self, path, max_age=POSTING_MAX_AGE, retention=POSTING_RETENTION, enabled=INCREMENTAL_SCRAPING):
+        self.path = path
+        self.max_age = max_age
+        self.retention = retention
+        self.enabled = enabled
+        self._local = threading.local()
+        self._stores_since_trim = 0
+
+    def _connect(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS postings "
+                "(source TEXT NOT NULL, job_id TEXT NOT NULL, fingerprint TEXT NOT NULL, details TEXT NOT NULL, "
+                "extracted_at REAL NOT NULL, last_seen REAL NOT NULL, PRIMARY KEY (source, job_id))"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS postings_last_seen ON postings (last_seen)")
+            self._local.conn = conn
+        return conn
+
+    def _rows(self, source, job_ids, min_extracted_at):
+        conn = self._connect()
+        rows = {}
+        job_ids = list(job_ids)
+        for i in range(0, len(job_ids), self.SQL_CHUNK):
+            chunk = job_ids[i:i + self.SQL_CHUNK]
+            placeholders = ",".join("?" * len(chunk))
+            for job_id, fingerprint, details in conn.execute(
+                f"SELECT job_id, fingerprint, details FROM postings "
+                f"WHERE source = ? AND extracted_at >= ? AND job_id IN ({placeholders})",
+                [source, min_extracted_at, *chunk]
+            ):
+                rows[job_id] = (fingerprint, details)
+        return rows
+
+    def known_ids(self, source, job_ids):
+        """IDs among job_ids with stored details young enough to reuse."""
+        if not self.enabled:
+            return set()
+        try:
+            return set(self._rows(source, {job_id for job_id in job_ids if job_id}, time.time() - self.max_age))
+        except sqlite3.Error as e:
+            print(f"Posting index read failed: {e}")
+            return set()
+
+    def known(self, source, cards, criteria):
+        """{job_id: job} for the cards whose stored details can be reused for this search."""
+        if not self.enabled:
+            return {}
+        job_ids = {card["job_id"] for card in cards if card["job_id"]}
+        try:
+            now = time.time()
+            rows = self._rows(source, job_ids, now - self.max_age)
+            conn = self._connect()
+            with conn:
+                conn.executemany(
+                    "UPDATE postings SET last_seen = ? WHERE source = ? AND job_id = ?",
+                    [(now, source, job_id) for job_id in rows]
                 )
-                time.sleep(2)
+        except sqlite3.Error as e:
+            print(f"Posting index read failed: {e}")
+            return {}
+        known = {}
+        for card in cards:
+            row = rows.get(card["job_id"])
+            if row is not None and row[0] == card["fingerprint"]:
+                known[card["job_id"]] = fill_from_criteria(json.loads(row[1]), criteria)
+        stage_metrics.increment("job_finder_postings_total", len(known), source=source, outcome="reused")
+        return known
+
+    def store(self, source, card, job):
+        if not self.enabled or not job or not card.get("job_id"):
+            return
+        stage_metrics.increment("job_finder_postings_total", source=source, outcome="extracted")
+        details = {field: value for field, value in job.items() if field not in job.get("from_criteria", ())}
+        try:
+            conn = self._connect()
+            now = time.time()
+            with conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO postings (source, job_id, fingerprint, details, extracted_at, last_seen) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (source, card["job_id"], card["fingerprint"], json.dumps(details), now, now)
+                )
+            self._stores_since_trim += 1
+            if self._stores_since_trim >= self.TRIM_EVERY:
+                self._stores_since_trim = 0
+                with conn:
+                    conn.execute("DELETE FROM postings WHERE last_seen < ?", (now - self.retention,))
+        except sqlite3.Error as e:
+            print(f"Posting index write failed: {e}")
+
+posting_index = PostingIndex(POSTING_INDEX_PATH)
+
+def merge_known_postings(source, cards, known, details):
+    """Yield jobs in listing order: stored details for known cards, the next extracted result for the others."""
+    details = iter(details)
+    for card in cards:
+        job = known.get(card["job_id"])
+        if job is None:
+            job = with_card_id(card, next(details, None))
+            posting_index.store(source, card, job)
+        yield job
+
+def known_run_reached(source):
+    """Scroll stop condition: the last INCREMENTAL_STOP_AFTER_KNOWN listing cards are all known postings."""
+    if not INCREMENTAL_SCRAPING or INCREMENTAL_STOP_AFTER_KNOWN <= 0:
+        return None
 
-                close_glassdoor_popups(driver)
+    def reached(driver):
+        tail = [card["job_id"] for card in read_listing_cards(driver, source)[-INCREMENTAL_STOP_AFTER_KNOWN:]]
+        if len(tail) < INCREMENTAL_STOP_AFTER_KNOWN or None in tail:
+            return False
+        return posting_index.known_ids(source, tail) >= set(tail)
+
+    return reached
+
+# ================= Card Triage =================
+# off (default), lexical, or embedding (lexical plus cached title embeddings). Triage skips some relevant postings,
+# so turn it on only where benchmarks/bench_scrapers.py shows an acceptable triage recall.
+CARD_TRIAGE = os.getenv("CARD_TRIAGE", "off")
+CARD_TRIAGE_MIN_SCORE = float(os.getenv("CARD_TRIAGE_MIN_SCORE", "0.3"))
+CARD_TRIAGE_EMBEDDING_MIN = float(os.getenv("CARD_TRIAGE_EMBEDDING_MIN", "0.5"))
+BM25_K1 = 1.2
+BM25_B = 0.75
+TRIAGE_STOPWORDS = {"a", "an", "and", "at", "for", "in", "of", "on", "or", "the", "to", "with"}
+
+def bm25_scores(documents, query_terms, k1=BM25_K1, b=BM25_B):
+    """BM25 score of each tokenized document for query_terms, and the IDF of each term over the documents."""
+    frequencies = collections.Counter(term for document in documents for term in set(document))
+    idf = {
+        term: math.log((len(documents) - frequencies[term] + 0.5) / (frequencies[term] + 0.5) + 1)
+        for term in query_terms
+    }
+    average_length = sum(map(len, documents)) / len(documents) or 1
+    scores = []
+    for document in documents:
+        counts = collections.Counter(document)
+        norm = k1 * (1 - b + b * len(document) / average_length)
+        scores.append(sum(idf[term] * counts[term] * (k1 + 1) / (counts[term] + norm) for term in query_terms if counts[term]))
+    return scores, idf
+
+def triage_cards(source, cards, criteria, progress=None, mode=None):
+    """Which listing cards are worth opening, judged from the card title alone.
+
+    A card is kept when its title is empty, contains the searched position, or scores at least CARD_TRIAGE_MIN_SCORE
+    in BM25 against the position and skill words. The IDF is taken over this listing's titles and the score is
+    divided by the total IDF of the position words, so a title holding every position word scores about 1. In
+    embedding mode, a card is also kept when its title embedding is at least CARD_TRIAGE_EMBEDDING_MIN similar to
+    the position's. mode overrides CARD_TRIAGE.
+    """
+    mode = mode or CARD_TRIAGE
+    if mode == "off" or not cards:
+        return [True] * len(cards)
+    with span("card_triage", source):
+        titles = [" ".join((card.get("title") or "").split()) for card in cards]
+        position = criteria.position.lower()
+        position_terms = {word for word in _words(position) if word not in TRIAGE_STOPWORDS}
+        query_terms = position_terms | {word for word in _words(criteria.skills) if word not in TRIAGE_STOPWORDS}
+        # Scored over distinct titles, so postings listed more than once do not skew the IDF.
+        distinct = list(dict.fromkeys(titles))
+        scores, idf = bm25_scores([_words(title) for title in distinct], query_terms)
+        score_of = dict(zip(distinct, scores))
+        full_score = sum(idf[term] for term in position_terms)
+        keep = [
+            not title or position in title.lower() or not full_score or score_of[title] / full_score >= CARD_TRIAGE_MIN_SCORE
+            for title in titles
+        ]
+        rows = [index for index, kept in enumerate(keep) if not kept]
+        if mode == "embedding" and rows:
+            similarities = encode_texts([titles[index] for index in rows]) @ encode_texts([criteria.position])[0]
+            for index, similarity in zip(rows, similarities):
+                keep[index] = bool(similarity >= CARD_TRIAGE_EMBEDDING_MIN)
+    skipped = keep.count(False)
+    if progress is not None:
+        progress.skipped(source, skipped)
+    stage_metrics.increment("job_finder_cards_skipped_total", skipped, source=source)
+    return keep
+
+# ================= Paged Listing Discovery =================
+LISTING_MODE = os.getenv("LISTING_MODE", "scroll")
+LISTING_PAGE_CAP = int(os.getenv("LISTING_PAGE_CAP", "10"))
+LISTING_PAGE_CONCURRENCY = int(os.getenv("LISTING_PAGE_CONCURRENCY", "4"))
+LINKEDIN_PAGE_SIZE = 25
+
+def linkedin_page_url(criteria, page):
+    """LinkedIn's guest listing endpoint, which returns 25 cards per start offset."""
+    query = urlencode({"keywords": criteria.position, "location": criteria.location, "start": page * LINKEDIN_PAGE_SIZE})
+    return f"{LINKEDIN_BASE_URL}/jobs-guest/jobs/api/seeMoreJobPostings/search?{query}"
+
+def glassdoor_page_url(first_page_url, page):
+    """Glassdoor numbers result pages with an _IP<n> suffix on the search URL."""
+    if page == 0:
+        return first_page_url
+    return re.sub(r"\.htm$", f"_IP{page + 1}.htm", first_page_url)
+
+def fetch_listing_page(source, url):
+    with span("listing_page", source):
+        try:
+            response = http_session.get(url, timeout=HTTP_TIMEOUT)
+            response.raise_for_status()
+        except requests.RequestException as e:
+            print(f"{source} listing page fetch failed for {url}: {e}")
+            return None
+        return parse_listing_cards(response.text, source, response.url)
+
+def discover_paged(source, page_url, page_cap=LISTING_PAGE_CAP, concurrency=LISTING_PAGE_CONCURRENCY):
+    """Fetch listing pages by offset, `concurrency` at a time, and merge their cards de-duplicated in page order.
+
+    Stops after page_cap pages or after the first wave that reaches the end of the listing.
+    """
+    pages = []
+    executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix=f"{source}-pages")
+    fetch = in_current_context(lambda page: fetch_listing_page(source, page_url(page)))
+    try:
+        for first in range(0, page_cap, concurrency):
+            if search_cut_short():
+                break
+            wave = list(executor.map(fetch, range(first, min(first + concurrency, page_cap))))
+            pages.extend(wave)
+            # An empty, failed or short page means the listing has run out.
+            if not all(wave) or len(wave[-1]) < len(pages[0]):
+                break
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    seen = set()
+    cards = []
+    for page_cards in pages:
+        for card in page_cards or ():
+            key = card["job_id"] or card["url"]
+            if key in seen:
+                continue
+            seen.add(key)
+            cards.append(card)
+    return cards
+
+# ================= Embedding Cache =================
+EMBEDDING_CACHE_PATH = os.getenv("EMBEDDING_CACHE_PATH", os.path.join(CACHE_DIR, "embeddings.sqlite3"))
+EMBEDDING_CACHE_MEMORY_ITEMS = int(os.getenv("EMBEDDING_CACHE_MEMORY_ITEMS", "5000"))
+EMBEDDING_CACHE_MAX_ITEMS = int(os.getenv("EMBEDDING_CACHE_MAX_ITEMS", "200000"))
+
+class EmbeddingCache:
+    """Content-addressed embeddings: an in-memory LRU in front of a SQLite file shared by all workers."""
+
+    SQL_CHUNK = 500
+
+    def __init__(self, path, model_name, memory_items=EMBEDDING_CACHE_MEMORY_ITEMS, max_items=EMBEDDING_CACHE_MAX_ITEMS):
+        self.path = path
+        self.model_name = model_name
+        self.memory_items = memory_items
+        self.max_items = max_items
+        self._memory = collections.OrderedDict()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._puts_since_trim = 0
+
+    def _connect(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings "
+                "(key TEXT PRIMARY KEY, vector BLOB NOT NULL, last_used REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS embeddings_last_used ON embeddings (last_used)")
+            self._local.conn = conn
+        return conn
+
+    def key(self, text):
+        return hashlib.sha256(f"{self.model_name}\0{text}".encode("utf-8")).hexdigest()
+
+    def _remember(self, key, vector):
+        self._memory[key] = vector
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_items:
+            self._memory.popitem(last=False)
+
+    def get_many(self, keys):
+        found = {}
+        missing = []
+        with self._lock:
+            for key in keys:
+                if key in self._memory:
+                    self._memory.move_to_end(key)
+                    found[key] = self._memory[key]
+                else:
+                    missing.append(key)
+        if not missing:
+            return found
 
-                try:
-                    show_more_btn = WebDriverWait(driver, 5).until(
-                        EC.element_to_be_clickable((By.CSS_SELECTOR, "button[data-test='show-more-cta'][aria-expanded='false']"))
-                    )
-                    driver.execute_script("arguments[0].scrollIntoView({behavior: 'smooth', block: 'center'});", show_more_btn)
-                    time.sleep(1)
-                    try:
-                        ActionChains(driver).move_to_element(show_more_btn).click().perform()
-                    except ElementClickInterceptedException:
-                        driver.execute_script("arguments[0].click();", show_more_btn)
-                    WebDriverWait(driver, 5).until(
-                        EC.presence_of_element_located((By.CSS_SELECTOR, "button[data-test='show-more-cta'][aria-expanded='true']"))
-                    )
-                    time.sleep(2)
-                except:
-                    pass
+        try:
+            conn = self._connect()
+            now = time.time()
+            for i in range(0, len(missing), self.SQL_CHUNK):
+                chunk = missing[i:i + self.SQL_CHUNK]
+                placeholders = ",".join("?" * len(chunk))
+                rows = conn.execute(
+                    f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders})", chunk
+                ).fetchall()
+                if not rows:
+                    continue
+                with conn:
+                    conn.executemany("UPDATE embeddings SET last_used = ? WHERE key = ?", [(now, key) for key, _ in rows])
+                with self._lock:
+                    for key, blob in rows:
+                        vector = np.frombuffer(blob, dtype=np.float32)
+                        found[key] = vector
+                        self._remember(key, vector)
+        except sqlite3.Error as e:
+            print(f"Embedding cache read failed: {e}")
+        return found
+
+    def put_many(self, vectors):
+        if not vectors:
+            return
+        with self._lock:
+            for key, vector in vectors.items():
+                self._remember(key, vector)
+        try:
+            conn = self._connect()
+            now = time.time()
+            with conn:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO embeddings (key, vector, last_used) VALUES (?, ?, ?)",
+                    [(key, np.asarray(vector, dtype=np.float32).tobytes(), now) for key, vector in vectors.items()]
+                )
+            self._puts_since_trim += len(vectors)
+            if self._puts_since_trim >= self.SQL_CHUNK:
+                self._puts_since_trim = 0
+                self._trim(conn)
+        except sqlite3.Error as e:
+            print(f"Embedding cache write failed: {e}")
+
+    def _trim(self, conn):
+        """Evict least recently used rows once the file grows past max_items."""
+        (count,) = conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()
+        if count > self.max_items:
+            with conn:
+                conn.execute(
+                    "DELETE FROM embeddings WHERE key IN "
+                    "(SELECT key FROM embeddings ORDER BY last_used LIMIT ?)",
+                    (count - self.max_items,)
+                )
 
-                try:
-                    job_title = driver.find_element(By.CSS_SELECTOR, "h1[id^='jd-job-title']").text.strip()
-                except:
-                    job_title = criteria.position
+embedding_cache = EmbeddingCache(EMBEDDING_CACHE_PATH, EMBEDDING_MODEL_KEY)
+
+# ================= Relevance Scoring =================
+RELEVANCE_THRESHOLD = 0.5
+EMBEDDING_BATCH_SIZE = 64
+
+def encode_texts(texts):
+    """Normalized embeddings for texts; only cache misses are sent to the model."""
+    keys = [embedding_cache.key(text) for text in texts]
+    vectors = embedding_cache.get_many(keys)
+    missing = {}
+    for key, text in zip(keys, texts):
+        if key not in vectors:
+            missing.setdefault(key, text)
+    if missing:
+        with span("embedding", "all"):
+            encoded = get_model().encode(
+                list(missing.values()), batch_size=EMBEDDING_BATCH_SIZE, normalize_embeddings=True, convert_to_numpy=True
+            ).astype(np.float32)
+        fresh = dict(zip(missing.keys(), encoded))
+        embedding_cache.put_many(fresh)
+        vectors.update(fresh)
+    stage_metrics.increment("job_finder_embeddings_total", len(missing), cache="miss")
+    stage_metrics.increment("job_finder_embeddings_total", len(keys) - len(missing), cache="hit")
+    return np.stack([vectors[key] for key in keys])
+
+def build_query(user_criteria):
+    return f"{user_criteria.position} requiring skills: {user_criteria.skills}"
+
+def job_text(job):
+    return f"{job.get('job_title', '')}. {job.get('description', '')}"
+
+def score_jobs(jobs, user_criteria):
+    """Cosine similarity of every job against the query via one matrix-vector product."""
+    if not jobs:
+        return np.zeros(0, dtype=np.float32)
+    query_embedding = encode_texts([build_query(user_criteria)])[0]
+    job_embeddings = encode_texts([job_text(job) for job in jobs])
+    return job_embeddings @ query_embedding
+
+def is_match(similarity, job_title, user_criteria):
+    threshold = RELEVANCE_THRESHOLD if user_criteria.min_score is None else user_criteria.min_score
+    return similarity > threshold or user_criteria.position.lower() in job_title.lower()
 
-                try:
-                    company = driver.find_element(By.CSS_SELECTOR, "h4[class*='heading_Subhead']").text.strip()
-                except:
-                    company = "N/A"
+def is_relevant(job_description, job_title, user_criteria):
+    similarity = score_jobs([{"job_title": job_title, "description": job_description}], user_criteria)[0]
+    return is_match(similarity, job_title, user_criteria)
+
+def filter_relevant_jobs(jobs, user_criteria):
+    with span("relevance", "all"):
+        scores = score_jobs(jobs, user_criteria)
+    return [
+        job for job, similarity in zip(jobs, scores)
+        if is_match(float(similarity), job.get("job_title", ""), user_criteria)
+    ]
 
-                try:
-                    location = driver.find_element(By.CSS_SELECTOR, "div[data-test='location'], div.companyLocation").text.strip()
-                except:
-                    location = criteria.location
+# ================= Duplicate Postings =================
+DEDUP_JOBS = os.getenv("DEDUP_JOBS", "1") != "0"
+DEDUP_DESCRIPTION_SIMILARITY = float(os.getenv("DEDUP_DESCRIPTION_SIMILARITY", "0.8"))
+DEDUP_TITLE_SIMILARITY = float(os.getenv("DEDUP_TITLE_SIMILARITY", "0.85"))
+MINHASH_SHINGLE = 3
+MINHASH_PRIME = (1 << 31) - 1
+_minhash_params = np.random.default_rng(20240501).integers(1, MINHASH_PRIME, size=(2, 64), dtype=np.uint64)
+COMPANY_SUFFIXES = {"co", "company", "corp", "corporation", "inc", "limited", "llc", "ltd", "plc", "private", "pvt", "smc"}
+LOCATION_NOISE = {"hybrid", "on", "onsite", "remote", "site"}
+
+def _words(text):
+    return re.findall(r"[a-z0-9]+", (text or "").lower())
+
+def posting_key(source, job):
+    """The source and posting ID of a job, from its apply link or its listing card, or None when it has neither.
+
+    A link without a posting ID is not an identity: Glassdoor's in-page details report the search results page.
+    """
+    job_id = posting_job_id(source, job.get("apply_link"), job.get("job_id"))
+    return (source, job_id) if job_id else None
+
+def company_key(company):
+    if (company or "").strip().upper() in ("", "N/A"):
+        return None
+    return " ".join(word for word in _words(company) if word not in COMPANY_SUFFIXES) or None
 
-                try:
-                    salary = driver.find_element(By.CSS_SELECTOR, "div[data-test='detailSalary'], div.salaryEstimate").text.strip()
-                except:
-                    salary = criteria.salary
+def location_key(job):
+    """The words of a job's scraped location, or None when it has none or only echoes the searched location."""
+    if "location" in job.get("from_criteria", ()):
+        return None
+    words = frozenset(word for word in _words(job.get("location")) if word not in LOCATION_NOISE)
+    return words or None
 
-                try:
-                    description = driver.find_element(By.CSS_SELECTOR, "div.JobDetails_jobDescription__uW_fK > div").text.strip()
-                except:
-                    description = ""
+def locations_compatible(location, other_location):
+    """Whether two location keys can name the same place: one is unknown or contains the other ("Lahore" and
+    "Lahore, Punjab, Pakistan"), unlike two different cities of the same country."""
+    return location is None or other_location is None or location <= other_location or other_location <= location
 
-                apply_link = driver.current_url
+def minhash(text):
+    """64-value MinHash signature of the word shingles of text, or None when it has no words.
 
-                job_info = {
-                    "job_title": job_title,
-                    "company": company,
-                    "experience": criteria.experience,
-                    "jobNature": criteria.jobNature,
-                    "location": location,
-                    "salary": salary,
-                    "description": description,
-                    "apply_link": apply_link
-                }
+    The share of positions where two signatures agree estimates the Jaccard similarity of the shingle sets.
+    """
+    words = _words(text)
+    if not words:
+        return None
+    shingles = {" ".join(words[i:i + MINHASH_SHINGLE]) for i in range(max(len(words) - MINHASH_SHINGLE + 1, 1))}
+    digests = b"".join(hashlib.blake2b(shingle.encode("utf-8"), digest_size=4).digest() for shingle in shingles)
+    hashes = np.frombuffer(digests, dtype=np.uint32).astype(np.uint64) % MINHASH_PRIME
+    a, b = _minhash_params
+    return ((a[:, None] * hashes + b[:, None]) % MINHASH_PRIME).min(axis=1)
+
+class DuplicateFilter:
+    """The distinct postings of one search, in first-seen order, each with the sources it was found on.
+
+    A job repeats an earlier one when its apply link or listing card names the same posting, or when the companies match, the
+    locations are compatible, the titles share most of their words and the description MinHashes estimate a shingle
+    overlap of at least description_similarity (with a description missing, the titles must be the same). Two
+    different posting IDs from the same source are never merged: those are separate openings. Repeats are merged
+    into the earlier job: fields it only took from the search criteria, or lacks, are filled from the repeat.
+    """
+
+    def __init__(
+        self, description_similarity=DEDUP_DESCRIPTION_SIMILARITY, title_similarity=DEDUP_TITLE_SIMILARITY, enabled=DEDUP_JOBS
+    ):
+        self.description_similarity = description_similarity
+        self.title_similarity = title_similarity
+        self.enabled = enabled
+        self.jobs = []
+        self.duplicates = collections.Counter()
+        self._links = {}
+        self._keys = []
+        self._companies = collections.defaultdict(list)
+
+    def _same_posting(self, title, fingerprint, location, other_title, other_fingerprint, other_location):
+        if not locations_compatible(location, other_location):
+            return False
+        if not title or len(title & other_title) < self.title_similarity * len(title | other_title):
+            return False
+        if fingerprint is None or other_fingerprint is None:
+            return title == other_title
+        return np.mean(fingerprint == other_fingerprint) >= self.description_similarity
+
+    def _merge(self, index, source, job):
+        kept = self.jobs[index]
+        if source not in kept["sources"]:
+            kept["sources"].append(source)
+        guessed = kept["from_criteria"]
+        for field, value in job.items():
+            if field in ("sources", "from_criteria") or not value or value == "N/A" or field in job.get("from_criteria", ()):
+                continue
+            if field in guessed or kept.get(field) in (None, "", "N/A"):
+                kept[field] = value
+                if field in guessed:
+                    guessed.remove(field)
+
+    def add(self, source, job):
+        """(index of the posting in self.jobs, whether job is a new posting rather than a repeat)."""
+        key = posting_key(source, job)
+        index = self._links.get(key) if key else None
+        company = company_key(job.get("company")) if self.enabled else None
+        title = set(_words(job.get("job_title")))
+        fingerprint = minhash(job.get("description")) if company else None
+        location = location_key(job)
+        if index is None and company:
+            for candidate, other_title, other_fingerprint, other_location in self._companies[company]:
+                other_key = self._keys[candidate].get(source)
+                if key and other_key and other_key != key:
+                    continue
+                if self._same_posting(title, fingerprint, location, other_title, other_fingerprint, other_location):
+                    index = candidate
+                    break
+        new = index is None
+        if new:
+            index = len(self.jobs)
+            self.jobs.append(dict(job, sources=[source], from_criteria=list(job.get("from_criteria", ()))))
+            self._keys.append({})
+            if company:
+                self._companies[company].append((index, title, fingerprint, location))
+        else:
+            self._merge(index, source, job)
+            self.duplicates[source] += 1
+            stage_metrics.increment("job_finder_duplicates_total", source=source)
+        if key:
+            self._links.setdefault(key, index)
+            self._keys[index].setdefault(source, key)
+        return index, new
+
+def dedupe_jobs(jobs_by_source):
+    """Distinct postings among {source: jobs}; run before relevance scoring so repeats are never embedded."""
+    duplicates = DuplicateFilter()
+    with span("dedup", "all"):
+        for source, jobs in jobs_by_source.items():
+            for job in jobs:
+                if job:
+                    duplicates.add(source, job)
+    return duplicates.jobs
+
+# ================= Job Corpus =================
+JOB_CORPUS = os.getenv("JOB_CORPUS", "1") != "0"
+JOB_CORPUS_PATH = os.getenv("JOB_CORPUS_PATH", os.path.join(CACHE_DIR, "corpus.sqlite3"))
+JOB_CORPUS_MAX_AGE = float(os.getenv("JOB_CORPUS_MAX_AGE", "86400"))
+JOB_CORPUS_TOP_K = int(os.getenv("JOB_CORPUS_TOP_K", "200"))
+JOB_CORPUS_EXPIRE_INTERVAL = 300
+JOB_CORPUS_SYNC_OVERLAP = 5
+IVF_MIN_ITEMS = int(os.getenv("IVF_MIN_ITEMS", "2000"))
+IVF_NPROBE = int(os.getenv("IVF_NPROBE", "0"))  # lists probed per query; 0 probes a sixth of them, at least 8
+IVF_TRAIN_SAMPLE = 20000
+IVF_TRAIN_ITERATIONS = 10
+IVF_ASSIGN_CHUNK = 8192
+
+class VectorIndex:
+    """Normalized vectors in the slots of one growable matrix, searched exactly or through an IVF partition.
+
+    Below min_ivf_items live vectors a query is one matrix-vector product over them. From there on, spherical
+    k-means splits the vectors into about sqrt(n) lists and a query only scores the nprobe lists whose centroids
+    are nearest. New vectors join the list of their nearest centroid, and the partition is retrained whenever
+    the index has doubled since it was last trained. Not thread-safe; JobCorpus holds its lock around every call.
+    """
+
+    def __init__(self, min_ivf_items=IVF_MIN_ITEMS, nprobe=IVF_NPROBE):
+        self.min_ivf_items = min_ivf_items
+        self.nprobe = nprobe
+        self.vectors = None
+        self.alive = np.zeros(0, dtype=bool)
+        self.lists = np.zeros(0, dtype=np.int32)
+        self.used = 0
+        self.live = 0
+        self.centroids = None
+        self.trained_size = 0
+        self._free = []
+
+    @property
+    def capacity(self):
+        return len(self.alive)
+
+    def _grow(self, dim):
+        capacity = max(2 * self.capacity, 1024)
+        vectors = np.zeros((capacity, dim), dtype=np.float32)
+        if self.vectors is not None:
+            vectors[:self.used] = self.vectors[:self.used]
+        self.vectors = vectors
+        self.alive = np.concatenate([self.alive, np.zeros(capacity - len(self.alive), dtype=bool)])
+        self.lists = np.concatenate([self.lists, np.full(capacity - len(self.lists), -1, dtype=np.int32)])
+
+    def add(self, vector):
+        """Store vector in a free slot and return the slot."""
+        if self._free:
+            slot = self._free.pop()
+        else:
+            if self.used == self.capacity:
+                self._grow(len(vector))
+            slot = self.used
+            self.used += 1
+        self.vectors[slot] = vector
+        self.alive[slot] = True
+        self.live += 1
+        if self.centroids is not None:
+            self.lists[slot] = int(np.argmax(self.centroids @ self.vectors[slot]))
+        if self.live >= self.min_ivf_items and self.live >= 2 * self.trained_size:
+            self.train()
+        return slot
+
+    def remove(self, slot):
+        if self.alive[slot]:
+            self.alive[slot] = False
+            self.lists[slot] = -1
+            self._free.append(slot)
+            self.live -= 1
+
+    def train(self, seed=0):
+        """Spherical k-means on a sample of the live vectors, then assign every live vector to its nearest centroid."""
+        live = np.flatnonzero(self.alive[:self.used])
+        if len(live) < self.min_ivf_items:
+            self.centroids = None
+            self.lists[:] = -1
+            self.trained_size = 0
+            return
+        rng = np.random.default_rng(seed)
+        sample = self.vectors[rng.choice(live, min(len(live), IVF_TRAIN_SAMPLE), replace=False)]
+        centroids = sample[rng.choice(len(sample), int(np.sqrt(len(live))), replace=False)].copy()
+        for _ in range(IVF_TRAIN_ITERATIONS):
+            assignment = np.argmax(sample @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assignment, sample)
+            norms = np.linalg.norm(sums, axis=1)
+            filled = norms > 0
+            centroids[filled] = sums[filled] / norms[filled, None]
+        for start in range(0, len(live), IVF_ASSIGN_CHUNK):
+            chunk = live[start:start + IVF_ASSIGN_CHUNK]
+            self.lists[chunk] = np.argmax(self.vectors[chunk] @ centroids.T, axis=1)
+        self.centroids = centroids
+        self.trained_size = len(live)
+
+    def search(self, query, k, mask=None):
+        """Up to k (slot, similarity) pairs, best first, among the live slots that mask allows."""
+        candidates = self.alive[:self.used].copy()
+        if mask is not None:
+            candidates &= mask
+        if self.centroids is not None:
+            # One extra False entry so the -1 list of removed slots never counts as probed.
+            probed = np.zeros(len(self.centroids) + 1, dtype=bool)
+            nprobe = self.nprobe or max(8, math.ceil(len(self.centroids) / 6))
+            probed[np.argsort(self.centroids @ query)[-nprobe:]] = True
+            in_probed = candidates & probed[self.lists[:self.used]]
+            # A selective filter can leave the probed lists short of k; scan every candidate then.
+            if np.count_nonzero(in_probed) >= k:
+                candidates = in_probed
+        slots = np.flatnonzero(candidates)
+        if not len(slots):
+            return []
+        if len(slots) * 2 > self.used:
+            # Scoring every slot in one pass is cheaper than first copying most of the matrix out by index.
+            scores = (self.vectors[:self.used] @ query)[slots]
+        else:
+            scores = self.vectors[slots] @ query
+        if len(slots) > k:
+            top = np.argpartition(-scores, k)[:k]
+            slots, scores = slots[top], scores[top]
+        order = np.argsort(-scores)
+        return list(zip(slots[order].tolist(), scores[order].tolist()))
+
+def _padded(array, length):
+    if len(array) >= length:
+        return array
+    return np.concatenate([array, np.zeros(length - len(array), dtype=array.dtype)])
+
+class JobCorpus:
+    """Every scraped posting with its embedding: a SQLite file shared by all workers plus a VectorIndex per process.
+
+    Rows are keyed by source and posting ID and tagged with the embedding model. Each process loads the fresh rows
+    on its first search and, on later searches, the rows any worker has stored since. Postings not scraped again
+    for max_age seconds drop out of searches and are deleted.
+    """
+
+    def __init__(self, path, model_name, max_age=JOB_CORPUS_MAX_AGE, enabled=JOB_CORPUS):
+        self.path = path
+        self.model_name = model_name
+        self.max_age = max_age
+        self.enabled = enabled
+        self.index = VectorIndex()
+        self._slots = {}
+        self._postings = {}
+        self._sources = {}
+        self._locations = {}
+        self._source_codes = np.zeros(0, dtype=np.int16)
+        self._location_codes = np.zeros(0, dtype=np.int32)
+        self._seen_at = np.zeros(0)
+        self._synced_at = 0.0
+        self._expired_at = time.time()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def _connect(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS corpus "
+                "(source TEXT NOT NULL, job_id TEXT NOT NULL, model TEXT NOT NULL, job TEXT NOT NULL, "
+                "location TEXT NOT NULL, vector BLOB NOT NULL, seen_at REAL NOT NULL, "
+                "PRIMARY KEY (source, job_id, model))"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS corpus_seen_at ON corpus (model, seen_at)")
+            self._local.conn = conn
+        return conn
+
+    def _put(self, source, job_id, job, location, vector, seen_at):
+        key = (source, job_id)
+        old = self._slots.pop(key, None)
+        if old is not None:
+            self.index.remove(old)
+            del self._postings[old]
+        slot = self.index.add(vector)
+        capacity = self.index.capacity
+        self._source_codes = _padded(self._source_codes, capacity)
+        self._location_codes = _padded(self._location_codes, capacity)
+        self._seen_at = _padded(self._seen_at, capacity)
+        self._slots[key] = slot
+        self._postings[slot] = (source, job_id, job)
+        self._source_codes[slot] = self._sources.setdefault(source, len(self._sources))
+        self._location_codes[slot] = self._locations.setdefault(" ".join(location.lower().split()), len(self._locations))
+        self._seen_at[slot] = seen_at
+
+    def add(self, source, jobs, criteria, vectors=None):
+        """Store scraped jobs for corpus searches, with their embeddings when the caller already has them.
+
+        The location a job is filtered on includes the searched location, since Glassdoor cards often
+        name only the city.
+        """
+        if not self.enabled:
+            return
+        if vectors is None:
+            jobs = [job for job in jobs if job and job.get("apply_link")]
+            vectors = encode_texts([job_text(job) for job in jobs]) if jobs else []
+        now = time.time()
+        rows = []
+        for job, vector in zip(jobs, vectors):
+            if not job or not job.get("apply_link"):
+                continue
+            link = job["apply_link"]
+            # Without a posting ID the link alone may be shared by unrelated jobs, so the row key covers the posting too.
+            job_id = posting_job_id(source, link, job.get("job_id")) or hashlib.sha1("\n".join(
+                str(job.get(field) or "") for field in ("apply_link", "job_title", "company", "description")
+            ).encode("utf-8")).hexdigest()
+            from_criteria = job.get("from_criteria", [])
+            details = {field: value for field, value in format_job(job).items() if field not in from_criteria}
+            details["from_criteria"] = from_criteria
+            location = " / ".join(text for text in (job.get("location"), criteria.location) if text)
+            rows.append((source, job_id, json.dumps(details), location, np.asarray(vector, dtype=np.float32), now))
+        if not rows:
+            return
+        try:
+            conn = self._connect()
+            with conn:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO corpus (source, job_id, model, job, location, vector, seen_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    [(source, job_id, self.model_name, job, location, vector.tobytes(), seen_at)
+                     for source, job_id, job, location, vector, seen_at in rows]
+                )
+        except sqlite3.Error as e:
+            print(f"Job corpus write failed: {e}")
+        with self._lock:
+            for source, job_id, job, location, vector, seen_at in rows:
+                self._put(source, job_id, json.loads(job), location, vector, seen_at)
+        stage_metrics.increment("job_finder_corpus_postings_total", len(rows), source=source, event="stored")
+
+    def _sync(self):
+        """Load the rows any worker stored since the last sync, and delete expired postings every few minutes."""
+        conn = self._connect()
+        now = time.time()
+        rows = conn.execute(
+            "SELECT source, job_id, job, location, vector, seen_at FROM corpus WHERE model = ? AND seen_at > ?",
+            (self.model_name, max(self._synced_at, now - self.max_age))
+        ).fetchall()
+        with self._lock:
+            for source, job_id, job, location, vector, seen_at in rows:
+                slot = self._slots.get((source, job_id))
+                if slot is None or self._seen_at[slot] < seen_at:
+                    self._put(source, job_id, json.loads(job), location, np.frombuffer(vector, dtype=np.float32), seen_at)
+            if rows:
+                # Rows committed by another worker can carry a slightly older timestamp than ours.
+                self._synced_at = max(self._synced_at, max(row[5] for row in rows) - JOB_CORPUS_SYNC_OVERLAP)
+            expire = now - self._expired_at >= JOB_CORPUS_EXPIRE_INTERVAL
+            if expire:
+                self._expired_at = now
+                used = self.index.used
+                stale = np.flatnonzero(self.index.alive[:used] & (self._seen_at[:used] < now - self.max_age))
+                for slot in stale.tolist():
+                    source, job_id, _ = self._postings.pop(slot)
+                    del self._slots[(source, job_id)]
+                    self.index.remove(slot)
+                    stage_metrics.increment("job_finder_corpus_postings_total", source=source, event="expired")
+        if expire:
+            with conn:
+                conn.execute("DELETE FROM corpus WHERE seen_at < ?", (now - self.max_age,))
+
+    def search(self, query_embedding, k, source=None, location=None):
+        """Up to k (job, similarity) pairs among fresh postings, optionally from one source and matching a location."""
+        if not self.enabled:
+            return []
+        try:
+            self._sync()
+        except sqlite3.Error as e:
+            print(f"Job corpus sync failed: {e}")
+        with self._lock:
+            used = self.index.used
+            mask = self._seen_at[:used] >= time.time() - self.max_age
+            if source is not None:
+                mask &= self._source_codes[:used] == self._sources.get(source, -1)
+            if location:
+                needle = " ".join(location.lower().split())
+                codes = [code for text, code in self._locations.items() if needle in text]
+                mask &= np.isin(self._location_codes[:used], codes)
+            hits = self.index.search(query_embedding, k, mask)
+            return [(self._postings[slot][2], similarity) for slot, similarity in hits]
+
+    def stats(self):
+        with self._lock:
+            return {
+                "postings": self.index.live,
+                "ivf_lists": 0 if self.index.centroids is None else len(self.index.centroids),
+                "trained_size": self.index.trained_size,
+            }
+
+job_corpus = JobCorpus(JOB_CORPUS_PATH, EMBEDDING_MODEL_KEY)
+
+# ================= Search Result Cache =================
+SEARCH_CACHE_TTL = float(os.getenv("SEARCH_CACHE_TTL", "900"))
+SEARCH_CACHE_STALE_TTL = float(os.getenv("SEARCH_CACHE_STALE_TTL", "3600"))
+SEARCH_CACHE_MAX_ENTRIES = int(os.getenv("SEARCH_CACHE_MAX_ENTRIES", "256"))
+CRITERIA_KEY_FIELDS = ("position", "experience", "salary", "jobNature", "location", "skills", "limit", "min_score")
+
+def normalize_criteria(criteria):
+    return tuple(" ".join(str(getattr(criteria, field)).lower().split()) for field in CRITERIA_KEY_FIELDS)
+
+class SearchResultCache:
+    """TTL cache of search responses with stale-while-revalidate and single-flight coalescing."""
+
+    def __init__(self, ttl=SEARCH_CACHE_TTL, stale_ttl=SEARCH_CACHE_STALE_TTL, max_entries=SEARCH_CACHE_MAX_ENTRIES):
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.max_entries = max_entries
+        self._entries = collections.OrderedDict()
+        self._inflight = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.refreshes = 0
+
+    def peek(self, criteria):
+        """The cached response for criteria if it is still fresh, without computing or refreshing it."""
+        key = normalize_criteria(criteria)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or time.monotonic() - entry[0] >= self.ttl:
+                return None
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def get_or_compute(self, criteria, compute, cache_if=bool):
+        key = normalize_criteria(criteria)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                stored_at, value = entry
+                age = time.monotonic() - stored_at
+                if age < self.ttl:
+                    self.hits += 1
+                    self._entries.move_to_end(key)
+                    return value
+                if age < self.ttl + self.stale_ttl:
+                    self.stale_hits += 1
+                    if key not in self._inflight:
+                        self.refreshes += 1
+                        future = self._inflight[key] = Future()
+                        # Refreshes queue for browsers behind the searches someone is waiting on.
+                        threading.Thread(
+                            target=with_priority(PRIORITY_BACKGROUND, self._compute),
+                            args=(key, future, criteria, compute, cache_if), daemon=True
+                        ).start()
+                    return value
+                del self._entries[key]
+
+            future = self._inflight.get(key)
+            if future is not None:
+                self.coalesced += 1
+                leader = False
+            else:
+                self.misses += 1
+                future = self._inflight[key] = Future()
+                leader = True
+
+        if leader:
+            self._compute(key, future, criteria, compute, cache_if)
+        return future.result()
+
+    def _compute(self, key, future, criteria, compute, cache_if):
+        try:
+            value = compute(criteria)
+        except BaseException as e:
+            with self._lock:
+                self._inflight.pop(key, None)
+            future.set_exception(e)
+            return
+        with self._lock:
+            if cache_if(value):
+                self._entries[key] = (time.monotonic(), value)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+            self._inflight.pop(key, None)
+        future.set_result(value)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "stale_hits": self.stale_hits,
+                "misses": self.misses,
+                "coalesced": self.coalesced,
+                "refreshes": self.refreshes,
+                "entries": len(self._entries),
+                "in_flight": len(self._inflight),
+            }
+
+search_cache = SearchResultCache()
+
+def format_job(job):
+    return {
+        "job_title": job.get("job_title", ""),
+        "company": job.get("company", ""),
+        "experience": job.get("experience", ""),
+        "jobNature": job.get("jobNature", ""),
+        "location": job.get("location", ""),
+        "salary": job.get("salary", ""),
+        "apply_link": job.get("apply_link", ""),
+        "sources": job.get("sources", []),
+    }
 
-                job_data.append(job_info)
+def run_search(criteria):
+    driver_pool.scheduler.admit()
+    if criteria.limit is not None or criteria.deadline_ms is not None:
+        return run_budgeted_search(criteria)
+    progress = SearchProgress()
+    budget = SearchBudget()
+    with ThreadPoolExecutor() as executor:
+        future_linkedin = executor.submit(with_budget(budget, scrape_linkedin_jobs), criteria, progress)
+        future_glassdoor = executor.submit(with_budget(budget, scrape_glassdoor_jobs), criteria, progress)
+        # A scraper turned away with SessionsBusy stops the other one, so the 429 is not held back by its scrape.
+        done, _ = wait([future_linkedin, future_glassdoor], return_when=FIRST_EXCEPTION)
+        if any(future.exception() is not None for future in done):
+            budget.stop("busy")
 
-            except Exception:
-                continue
+        linkedin_results = future_linkedin.result()
+        glassdoor_results = future_glassdoor.result()
 
-        return job_data
+    all_jobs = dedupe_jobs({"linkedin": linkedin_results, "glassdoor": glassdoor_results})
+    for source in JOB_SOURCES:
+        job_corpus.add(source, [job for job in all_jobs if job["sources"][0] == source], criteria)
 
-    except Exception as e:
-        print(f"Glassdoor scraping failed: {e}")
-        return []
+    relevant = filter_relevant_jobs(all_jobs, criteria)
+    with span("response_build", "all"):
+        relevant_jobs = [format_job(job) for job in relevant]
+    stage_metrics.increment("job_finder_relevant_jobs_total", len(relevant_jobs))
+    skipped = progress.snapshot()
+    return {
+        "relevant_jobs": relevant_jobs,
+        "cards_skipped": {source: skipped.get(source, {}).get("skipped", 0) for source in JOB_SOURCES},
+    }
 
+# ================= Streaming Search =================
+JOB_SOURCES = {
+    "linkedin": iter_linkedin_jobs,
+    "glassdoor": iter_glassdoor_jobs,
+}
+
+def stream_search(criteria, progress=None, raise_busy=False):
+    """Yield a scored record per job as soon as a scraper produces it, then one summary record.
+
+    With a limit or deadline in the criteria, scraping and scoring stop once `limit` relevant jobs have been
+    yielded or the deadline passes, and the summary is marked partial, as it is when a source fails. A job that repeats one already scraped is
+    not scored; a "duplicate" record names the apply link of the job it repeats and that job's sources so far.
+    With raise_busy, a source turned away with SessionsBusy stops the other one and the SessionsBusy is raised
+    here, as run_search does; otherwise it is reported among the summary errors like any scraper failure.
+    """
+    started = time.monotonic()
+    events = queue.Queue()
+    budget = SearchBudget.for_criteria(criteria)
+    duplicates = DuplicateFilter()
+    progress = progress or SearchProgress()
+    busy = []
+
+    def produce(source, iter_jobs):
+        source_started = time.monotonic()
+        error = None
+        try:
+            for job in iter_jobs(criteria, progress):
+                events.put(("job", source, job))
+                if budget.exhausted():
+                    break
+        except SessionsBusy as e:
+            error = str(e)
+            if raise_busy:
+                busy.append(e)
+                budget.stop("busy")
+        except Exception as e:
+            print(f"{source} scraping failed: {e}")
+            error = str(e)
+        events.put(("done", source, (time.monotonic() - source_started, error)))
+
+    for source, iter_jobs in JOB_SOURCES.items():
+        threading.Thread(target=with_budget(budget, produce), args=(source, iter_jobs), daemon=True).start()
+
+    counts = {source: {"scraped": 0, "skipped": 0, "relevant": 0, "duplicates": 0} for source in JOB_SOURCES}
+    timings = {}
+    errors = {}
+    first_result = None
+    pending = len(JOB_SOURCES)
+    try:
+        query_embedding = encode_texts([build_query(criteria)])[0]
+        while pending and not budget.exhausted():
+            # Score whatever has queued up since the last pass as one micro-batch.
+            try:
+                batch = [events.get(timeout=budget.time_left())]
+            except queue.Empty:
+                budget.exhausted()
+                break
+            while len(batch) < EMBEDDING_BATCH_SIZE:
+                try:
+                    batch.append(events.get_nowait())
+                except queue.Empty:
+                    break
+
+            scraped = []
+            repeats = []
+            for kind, source, job in batch:
+                if kind != "job":
+                    continue
+                index, new = duplicates.add(source, job)
+                if new:
+                    scraped.append((source, duplicates.jobs[index]))
+                else:
+                    counts[source]["duplicates"] += 1
+                    repeats.append((source, duplicates.jobs[index]))
+            if scraped:
+                embeddings = encode_texts([job_text(job) for _, job in scraped])
+                for source in JOB_SOURCES:
+                    rows = [index for index, (job_source, _) in enumerate(scraped) if job_source == source]
+                    if rows:
+                        job_corpus.add(source, [scraped[index][1] for index in rows], criteria, embeddings[rows])
+                scores = embeddings @ query_embedding
+                for (source, job), similarity in zip(scraped, scores):
+                    if budget.exhausted():
+                        break
+                    relevant = is_match(float(similarity), job.get("job_title", ""), criteria)
+                    counts[source]["scraped"] += 1
+                    counts[source]["relevant"] += int(relevant)
+                    if first_result is None:
+                        first_result = time.monotonic() - started
+                    yield {
+                        "type": "job",
+                        "source": source,
+                        "relevant": relevant,
+                        "score": round(float(similarity), 4),
+                        "job": format_job(job),
+                    }
+                    if relevant:
+                        budget.found_relevant()
+            for source, job in repeats:
+                yield {"type": "duplicate", "source": source, "apply_link": job.get("apply_link", ""), "sources": list(job["sources"])}
+
+            for kind, source, payload in batch:
+                if kind == "done":
+                    pending -= 1
+                    timings[f"{source}_seconds"] = round(payload[0], 3)
+                    if payload[1]:
+                        errors[source] = payload[1]
+        if busy:
+            raise busy[0]
+        stopped = budget.stopped
     finally:
-        driver.quit()
-
-def is_relevant(job_description, job_title, user_criteria):
-    job_text = f"{job_title}. {job_description}"
-    query = f"{user_criteria.position} requiring skills: {user_criteria.skills}"
+        # Also stops the scrapers when the client goes away mid-stream.
+        budget.stop("cancelled")
+
+    for source, counters in progress.snapshot().items():
+        counts[source]["skipped"] = counters["skipped"]
+    timings["first_result_seconds"] = round(first_result, 3) if first_result is not None else None
+    timings["total_seconds"] = round(time.monotonic() - started, 3)
+    yield {
+        "type": "summary",
+        "counts": counts,
+        "timings": timings,
+        "errors": errors,
+        # A source that failed contributed only what it scraped before the error.
+        "partial": stopped is not None or bool(errors),
+        "stopped": stopped,
+    }
 
-    query_embedding = model.encode(query)
-    desc_embedding = model.encode(job_text)
-    similarity = 1 - cosine(query_embedding, desc_embedding)
+def apply_duplicate_record(jobs, record):
+    """Update the sources of the collected job a stream "duplicate" record points at, if it was collected."""
+    for job in jobs:
+        if record["apply_link"] and job["apply_link"] == record["apply_link"]:
+            job["sources"] = record["sources"]
+
+def run_budgeted_search(criteria):
+    """/search_jobs response for criteria with a limit or deadline: the relevant jobs stream_search got to."""
+    relevant = {source: [] for source in JOB_SOURCES}
+    summary = {}
+    for record in stream_search(criteria, raise_busy=True):
+        if record["type"] == "summary":
+            summary = record
+        elif record["type"] == "duplicate":
+            apply_duplicate_record(itertools.chain.from_iterable(relevant.values()), record)
+        elif record["relevant"]:
+            relevant[record["source"]].append(record["job"])
+    with span("response_build", "all"):
+        relevant_jobs = [job for source in JOB_SOURCES for job in relevant[source]]
+    stage_metrics.increment("job_finder_relevant_jobs_total", len(relevant_jobs))
+    return {
+        "relevant_jobs": relevant_jobs,
+        "cards_skipped": {source: counts.get("skipped", 0) for source, counts in summary.get("counts", {}).items()},
+        "partial": summary.get("partial", False),
+        "stopped": summary.get("stopped"),
+        "errors": summary.get("errors", {}),
+    }
 
-    return similarity > 0.5 or user_criteria.position.lower() in job_title.lower()
+def run_corpus_search(criteria, source=None):
+    """/search_jobs?mode=corpus: the stored postings nearest to the query, without scraping."""
+    with span("corpus_search", source or "all"):
+        query_embedding = encode_texts([build_query(criteria)])[0]
+        hits = job_corpus.search(query_embedding, JOB_CORPUS_TOP_K, source=source, location=criteria.location)
+    with span("response_build", "all"):
+        relevant_jobs = [
+            format_job(fill_from_criteria(job, criteria)) for job, similarity in hits
+            if is_match(similarity, job.get("job_title") or "", criteria)
+        ][:criteria.limit]
+    stage_metrics.increment("job_finder_relevant_jobs_total", len(relevant_jobs))
+    return {"relevant_jobs": relevant_jobs, "corpus_size": job_corpus.index.live}
 
 @app.post("/search_jobs")
-def search_jobs(criteria: JobSearchCriteria):
-    with ThreadPoolExecutor() as executor:
-        future_linkedin = executor.submit(scrape_linkedin_jobs, criteria)
-        future_glassdoor = executor.submit(scrape_glassdoor_jobs, criteria)
-
-        linkedin_results = future_linkedin.result()
-        glassdoor_results = future_glassdoor.result()
+def search_jobs(
+    criteria: JobSearchCriteria,
+    timing: bool = Query(False),
+    mode: str = Query("live", pattern="^(live|corpus)$"),
+    source: Optional[str] = Query(None, pattern="^(linkedin|glassdoor)$"),
+    refresh: bool = Query(False),
+):
+    """With ?timing=true the response carries an X-Timing header of per-source stage durations.
+
+    ?mode=corpus answers from postings scraped earlier (optionally one ?source) without opening a browser;
+    ?refresh=true also starts a background live search that refreshes the corpus, pollable at the returned URL.
+    """
+    timing_token = request_timing.set(RequestTiming()) if timing else None
+    try:
+        if mode == "corpus":
+            response = run_corpus_search(criteria, source)
+            if refresh:
+                try:
+                    driver_pool.scheduler.admit()
+                    response["refresh"] = f"/searches/{search_tasks.submit(criteria, reuse_active=True).id}"
+                except SessionsBusy:
+                    response["refresh"] = None
+        elif criteria.deadline_ms is not None:
+            # A deadline search neither joins nor leads a shared scrape: a follower would wait past its deadline
+            # and a leader's cut-short result would reach callers without one. It only reuses a fresh entry.
+            response = search_cache.peek(criteria)
+            if response is None:
+                response = run_search(criteria)
+        else:
+            # Scrapers swallow their own errors and return [], so empty responses are not cached, nor are
+            # budgeted ones a source failed on.
+            response = search_cache.get_or_compute(
+                criteria, run_search,
+                cache_if=lambda response: bool(response["relevant_jobs"]) and not response.get("errors")
+            )
+        if timing_token is None:
+            return response
+        return JSONResponse(response, headers={"X-Timing": request_timing.get().header()})
+    finally:
+        if timing_token is not None:
+            request_timing.reset(timing_token)
+
+# ================= Background Searches =================
+SEARCH_WORKERS = int(os.getenv("SEARCH_WORKERS", "2"))
+SEARCH_RESULT_TTL = float(os.getenv("SEARCH_RESULT_TTL", "3600"))
+
+class SearchTask:
+    """A search submitted through POST /searches and run on the background worker pool."""
+
+    def __init__(self, criteria):
+        self.id = uuid.uuid4().hex
+        self.criteria = criteria
+        self.status = "queued"
+        self.progress = SearchProgress()
+        self.relevant_jobs = []
+        self.summary = None
+        self.error = None
+        self.created_at = time.time()
+        self.finished_at = None
+
+    def run(self):
+        self.status = "running"
+        try:
+            for record in stream_search(self.criteria, self.progress):
+                if record["type"] == "summary":
+                    self.summary = record
+                elif record["type"] == "duplicate":
+                    apply_duplicate_record(self.relevant_jobs, record)
+                elif record["relevant"]:
+                    self.relevant_jobs.append(record["job"])
+            self.status = "done"
+        except Exception as e:
+            print(f"Search {self.id} failed: {e}")
+            self.error = str(e)
+            self.status = "failed"
+        finally:
+            self.finished_at = time.time()
+
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "status": self.status,
+            "progress": self.progress.snapshot(),
+            "partial": self.status != "done" or bool(self.summary and self.summary["partial"]),
+            "relevant_jobs": list(self.relevant_jobs),
+            "summary": self.summary,
+            "error": self.error,
+        }
+
+class SearchTaskStore:
+    """Submitted searches by ID; finished ones are dropped after SEARCH_RESULT_TTL seconds."""
+
+    def __init__(self, workers=SEARCH_WORKERS, ttl=SEARCH_RESULT_TTL):
+        self.ttl = ttl
+        self._tasks = {}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="search")
+
+    def _expire(self):
+        cutoff = time.time() - self.ttl
+        for task_id, task in list(self._tasks.items()):
+            if task.finished_at is not None and task.finished_at < cutoff:
+                del self._tasks[task_id]
+
+    def submit(self, criteria, reuse_active=False):
+        """Queue a search; with reuse_active, an unfinished search for the same criteria is returned instead."""
+        with self._lock:
+            self._expire()
+            if reuse_active:
+                key = normalize_criteria(criteria)
+                for task in self._tasks.values():
+                    if task.finished_at is None and normalize_criteria(task.criteria) == key:
+                        return task
+            task = SearchTask(criteria)
+            self._tasks[task.id] = task
+        self._executor.submit(with_priority(PRIORITY_BACKGROUND, task.run))
+        return task
+
+    def get(self, task_id):
+        with self._lock:
+            self._expire()
+            return self._tasks.get(task_id)
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+search_tasks = SearchTaskStore()
+
+@app.post("/searches", status_code=202)
+def submit_search(criteria: JobSearchCriteria):
+    driver_pool.scheduler.admit()
+    task = search_tasks.submit(criteria)
+    return {"id": task.id, "status": task.status, "url": f"/searches/{task.id}"}
+
+@app.get("/searches/{search_id}")
+def get_search(search_id: str):
+    task = search_tasks.get(search_id)
+    if task is None:
+        raise HTTPException(status_code=404, detail="Search not found or expired")
+    return task.to_dict()
+
+@app.post("/search_jobs/stream")
+def search_jobs_stream(criteria: JobSearchCriteria, stream_format: str = Query("ndjson", alias="format")):
+    driver_pool.scheduler.admit()
+    if stream_format == "sse":
+        records = (f"event: {record['type']}\ndata: {json.dumps(record)}\n\n" for record in stream_search(criteria))
+        return StreamingResponse(
+            records, media_type="text/event-stream", headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+        )
+    records = (json.dumps(record) + "\n" for record in stream_search(criteria))
+    return StreamingResponse(records, media_type="application/x-ndjson")
+
+@app.get("/stats/search_cache")
+def search_cache_stats():
+    return search_cache.stats()
+
+@app.get("/stats/sessions")
+def session_stats():
+    return driver_pool.scheduler.snapshot()
+
+@app.get("/stats/browsers")
+def browser_stats():
+    return browser_processes.snapshot()
+
+@app.get("/stats/corpus")
+def corpus_stats():
+    return job_corpus.stats()
+
+@app.get("/stats/waits")
+def wait_stats():
+    return wait_engine.snapshot()
+
+@app.get("/stats/parsing")
+def parsing_stats():
+    return parse_stats.snapshot()
+
+@app.get("/metrics")
+def metrics():
+    waits = wait_engine.snapshot()
+    cache = search_cache.stats()
+    extra_counters = [
+        ("job_finder_waits_total", "Adaptive waits per source and step.", [
+            ([("source", key.split(".", 1)[0]), ("step", key.split(".", 1)[1])], stats["count"]) for key, stats in waits.items()
+        ]),
+        ("job_finder_wait_timeouts_total", "Adaptive waits that timed out.", [
+            ([("source", key.split(".", 1)[0]), ("step", key.split(".", 1)[1])], stats["timeouts"]) for key, stats in waits.items()
+        ]),
+        ("job_finder_search_cache_events_total", "Search result cache lookups by outcome.", [
+            ([("event", event)], cache[event]) for event in ("hits", "stale_hits", "misses", "coalesced", "refreshes")
+        ]),
+    ]
+    sessions = driver_pool.scheduler.snapshot()
+    session_sources = sorted(set(SOURCE_MAX_SESSIONS) | set(sessions["in_use"]) | set(sessions["waiting"]))
+    gauges = [
+        ("job_finder_sessions_in_use", "Browser sessions checked out, per source.", [
+            ([("source", source)], sessions["in_use"].get(source, 0)) for source in session_sources
+        ]),
+        ("job_finder_session_queue_depth", "Browser checkouts waiting for a session, per source.", [
+            ([("source", source)], sessions["waiting"].get(source, 0)) for source in session_sources
+        ]),
+    ]
+    if psutil is not None:
+        browsers = browser_processes.snapshot()
+        gauges += [
+            ("job_finder_browser_sessions", "Browser sessions whose process trees are tracked.", [([], browsers["sessions"])]),
+            ("job_finder_browser_rss_bytes", "Resident memory of all tracked chromedriver and Chrome processes.", [
+                ([], browsers["rss_bytes"])
+            ]),
+        ]
+    return PlainTextResponse(stage_metrics.render(extra_counters, gauges), media_type="text/plain; version=0.0.4")
 
-    all_jobs = linkedin_results + glassdoor_results
-
-    relevant_jobs = []
-    for job in all_jobs:
-        if is_relevant(job.get("description", ""), job.get("job_title", ""), criteria):
-            relevant_jobs.append({
-                "job_title": job.get("job_title", ""),
-                "company": job.get("company", ""),
-                "experience": job.get("experience", ""),
-                "jobNature": job.get("jobNature", ""),
-                "location": job.get("location", ""),
-                "salary": job.get("salary", ""),
-                "apply_link": job.get("apply_link", "")
-            })
-
-    return {"relevant_jobs": relevant_jobs}
+if __name__ == "__main__":
+    import uvicorn
+    uvicorn.run(app, host="0.0.0.0", port=8000)
 
 #############################################
 ##With Meta Llama 3.2 1B Parameter